@@ -1,26 +1,54 @@
 """FastAPI backend for CultHeld events API."""
 
+import base64
+import json
 import os
-from datetime import datetime
+import threading
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
 
+import anyio
 import duckdb
-from fastapi import FastAPI, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+from cache import ResponseCache, etag_matches
+from search import SearchIndex
+
 # Configuration
 # In production, use local events.duckdb; in dev, use data_acquisition path
 # Check if running on Railway/Render by looking for environment indicators
 is_production = os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("RENDER") or os.getenv("RAILWAY_TOKEN") or os.path.exists("/app")
 
-if is_production:
+if os.getenv("EVENTS_DB_PATH"):
+    # Explicit override, e.g. the serving database written by `python -m core.export`
+    DB_PATH = Path(os.environ["EVENTS_DB_PATH"])
+elif is_production:
     DB_PATH = Path("/app/backend/events.duckdb")
     # Fallback if the above doesn't exist
     if not DB_PATH.exists():
         DB_PATH = Path(__file__).parent / "events.duckdb"
 else:
-    DB_PATH = Path(__file__).parent.parent / "data_acquisition" / "data" / "core" / "events.duckdb"
+    # The serving database, which `python -m core.export serving` replaces atomically. The
+    # pipeline's own data/core/events.duckdb is not read: holding it open, even read-only,
+    # would block the pipeline's writes.
+    DB_PATH = Path(__file__).parents[1] / "data_acquisition" / "data" / "serving" / "events.duckdb"
+
+# Date filters and returned start times use Amsterdam local time
+LOCAL_TIMEZONE = "Europe/Amsterdam"
+
+# Maximum number of DuckDB queries running at once; further requests wait for a slot
+DB_MAX_CONCURRENCY = int(os.getenv("DB_MAX_CONCURRENCY", "4"))
+
+# Rendered responses are cached per database file; entries also expire after the TTL
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+# How long browsers and CDNs may reuse a response before revalidating it
+CACHE_MAX_AGE = int(os.getenv("CACHE_MAX_AGE", "60"))
 
 # CORS: Allow your domain in production
 CORS_ORIGINS = [
@@ -60,32 +88,244 @@ class Event(BaseModel):
 
 
 class EventsResponse(BaseModel):
-    total: int
+    total: int | None
     page: int
     limit: int
     events: list[Event]
+    next_cursor: str | None = None
+
+
+class FacetValue(BaseModel):
+    value: str
+    count: int
+
 
+class FacetsResponse(BaseModel):
+    venues: list[FacetValue]
+    event_types: list[FacetValue]
+    min_date: str | None
+    max_date: str | None
 
-def get_db_connection():
-    """Get a read-only DuckDB connection."""
-    return duckdb.connect(database=str(DB_PATH), read_only=True)
+
+def local_midnight(day: str, days_after: int = 0) -> datetime:
+    """Return midnight in Amsterdam for a YYYY-MM-DD string, optionally days later."""
+    midnight = datetime.strptime(day, "%Y-%m-%d") + timedelta(days=days_after)
+    return midnight.replace(tzinfo=ZoneInfo(LOCAL_TIMEZONE))
+
+
+def encode_cursor(start_date_time: datetime | None, venue: str, event_name: str | None) -> str:
+    """Encode the sort key of the last returned event as an opaque cursor.
+
+    Events without a start time sort last; their cursor carries a null start.
+    """
+    start = start_date_time.isoformat() if start_date_time is not None else None
+    key = [start, venue, event_name or ""]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime | None, str, str]:
+    """Decode a cursor produced by `encode_cursor`; raises ValueError if malformed."""
+    try:
+        start, venue, event_name = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        start = datetime.fromisoformat(start) if start is not None else None
+        return start, str(venue), str(event_name)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# Tables the pipeline derives from `events` on every write. For database files written
+# before a table existed, an equivalent per-connection view is created instead.
+DERIVED_TABLE_QUERIES = {
+    # Latest version of every event
+    "events_latest": """
+        SELECT * FROM events
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY venue, event_name, start_date_time
+            ORDER BY as_of_date DESC
+        ) = 1
+    """,
+    # Events per Amsterdam calendar day, venue and event type
+    "events_daily_counts": f"""
+        SELECT
+            CAST(timezone('{LOCAL_TIMEZONE}', start_date_time) AS DATE) AS day,
+            venue,
+            event_type,
+            COUNT(*) AS events
+        FROM events_latest
+        WHERE start_date_time IS NOT NULL
+        GROUP BY ALL
+    """,
+}
+
+
+class DatabasePool:
+    """Shared read-only DuckDB handle that hands out one cursor per thread.
+
+    The database is opened once and kept open so DuckDB's catalog and buffer
+    cache survive between requests. When the file on disk is replaced (a new
+    scrape was deployed), the handle is reopened on the next request.
+
+    Queries run in worker threads (at most `max_concurrency` at a time) so a
+    slow query never blocks the event loop.
+    """
+
+    ALIAS = "events_db"
+
+    def __init__(self, path: Path, max_concurrency: int = DB_MAX_CONCURRENCY):
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.generation = 0
+        self._limiter: anyio.CapacityLimiter | None = None
+        self.search_index = SearchIndex()
+        self._con: duckdb.DuckDBPyConnection | None = None
+        self._signature: tuple[int, int, int] | None = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def file_signature(self) -> tuple[int, int, int]:
+        """Identify the current database file (changes when a new file is deployed)."""
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def open(self) -> None:
+        """Open (or reopen) the shared database handle."""
+        with self._lock:
+            self._open_locked()
+
+    def _open_locked(self) -> None:
+        signature = self.file_signature()
+        # Attach into a fresh in-memory instance: connecting to the path directly would
+        # reuse DuckDB's cached instance for the old file while its cursors are alive.
+        con = duckdb.connect()
+        con.execute(f"ATTACH '{self.path}' AS {self.ALIAS} (READ_ONLY)")
+        # Cursors still in use keep the previous handle alive until they are dropped
+        self._con = con
+        self._signature = signature
+        self.generation += 1
+        print(f"Opened database {self.path} (generation {self.generation})")
+
+        # Bring the search index in line with the new data (only changed names are touched)
+        cur = con.cursor()
+        cur.execute(f"USE {self.ALIAS}")
+        _ensure_derived_tables(cur)
+        names = cur.execute("SELECT DISTINCT event_name FROM events_latest").fetchall()
+        self.search_index.update(n[0] for n in names)
+        cur.close()
+
+    def close(self) -> None:
+        """Close the shared database handle."""
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+            self._con = None
+            self._signature = None
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return this thread's cursor, reopening the database if the file changed."""
+        if self._con is None or self.file_signature() != self._signature:
+            with self._lock:
+                if self._con is None or self.file_signature() != self._signature:
+                    self._open_locked()
+
+        local = self._local
+        if getattr(local, "generation", None) != self.generation:
+            local.cursor = self._con.cursor()
+            local.cursor.execute(f"USE {self.ALIAS}")
+            local.cursor.execute(f"SET TimeZone = '{LOCAL_TIMEZONE}'")
+            local.generation = self.generation
+            _ensure_derived_tables(local.cursor)
+        return local.cursor
+
+    async def search(self, query: str) -> set[str] | None:
+        """Return event names matching `query` (prefix, accent-insensitive)."""
+        return await self._run(self._search_sync, query)
+
+    def _search_sync(self, query: str) -> set[str] | None:
+        # Runs in a worker thread: a replaced file triggers a reopen and reindex here
+        self.cursor()
+        return self.search_index.search(query)
+
+    async def fetchall(self, query: str, params: list[Any] | None = None) -> list[tuple]:
+        """Run a query in a worker thread and return all rows."""
+        return await self._run(lambda: self.cursor().execute(query, params).fetchall())
+
+    async def fetchone(self, query: str, params: list[Any] | None = None) -> tuple | None:
+        """Run a query in a worker thread and return the first row."""
+        return await self._run(lambda: self.cursor().execute(query, params).fetchone())
+
+    async def _run(self, func, *args):
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.max_concurrency)
+        return await anyio.to_thread.run_sync(func, *args, limiter=self._limiter)
+
+
+def _ensure_derived_tables(con: duckdb.DuckDBPyConnection) -> None:
+    """Expose derived tables as views if the database file predates them."""
+    existing = {
+        r[0] for r in con.execute("SELECT table_name FROM duckdb_tables()").fetchall()
+    }
+    for name, query in DERIVED_TABLE_QUERIES.items():
+        if name not in existing:
+            con.execute(f"CREATE TEMP VIEW {name} AS {query}")
+
+
+db_pool = DatabasePool(DB_PATH)
+
+
+async def get_db_pool() -> DatabasePool:
+    """FastAPI dependency providing the process-wide database pool."""
+    return db_pool
+
+
+response_cache = ResponseCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+
+async def cached_response(
+    request: Request, db: DatabasePool, key: tuple, build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """Serve a JSON response from the cache, building it on a miss.
+
+    The key is extended with the database file signature, so a new scrape
+    invalidates every entry. Answers 304 when If-None-Match carries the ETag.
+    """
+    key = (*key, db.file_signature())
+    entry = response_cache.get(key)
+    if entry is None:
+        payload = await build()
+        if isinstance(payload, BaseModel):
+            body = payload.model_dump_json().encode("utf-8")
+        else:
+            body = json.dumps(payload).encode("utf-8")
+        entry = response_cache.put(key, body)
+
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={CACHE_MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information."""
+    """Open the database pool and log startup information."""
     print(f"Starting CultHeld API")
     print(f"DB_PATH: {DB_PATH}")
     print(f"DB exists: {DB_PATH.exists()}")
+    if not DB_PATH.exists():
+        print("Build it with `python -m core.export serving` in data_acquisition")
     try:
-        conn = get_db_connection()
-        result = conn.execute("SELECT COUNT(*) as count FROM events").fetchall()
-        print(f"Database connected. Total events: {result[0][0]}")
-        conn.close()
+        await anyio.to_thread.run_sync(db_pool.open)
+        result = await db_pool.fetchone("SELECT COUNT(*) as count FROM events_latest")
+        print(f"Database connected. Total events: {result[0]}")
     except Exception as e:
         print(f"Database error on startup: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the database pool."""
+    db_pool.close()
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
@@ -94,6 +334,7 @@ async def health() -> dict:
 
 @app.get("/api/events", response_model=EventsResponse)
 async def get_events(
+    request: Request,
     venue: str | None = Query(None, description="Filter by venue"),
     event_type: str | None = Query(None, description="Filter by event type"),
     start_date: str | None = Query(None, description="Filter by start date (YYYY-MM-DD)"),
@@ -101,33 +342,41 @@ async def get_events(
     search: str | None = Query(None, description="Search in event names"),
     page: int = Query(None, description="Page number (1-indexed) - deprecated, use offset instead"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
+    cursor: str | None = Query(
+        None,
+        description="Continue after this cursor (from next_cursor); takes precedence over offset",
+    ),
     limit: int = Query(50, ge=1, le=500, description="Results per page"),
+    include_total: bool = Query(
+        True, description="Include the total match count (clients can skip it after page 1)"
+    ),
+    db: DatabasePool = Depends(get_db_pool),
 ) -> EventsResponse:
     """Get events with optional filters and pagination."""
-    try:
-        con = get_db_connection()
-
-        # Support both page-based (deprecated) and offset-based pagination
-        if page is not None:
-            offset = (page - 1) * limit
-        
-        # Use page for response if provided, otherwise calculate from offset
-        response_page = page if page is not None else (offset // limit) + 1
-
-        # Build base query with latest events (using window function)
-        query = """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Support both page-based (deprecated) and offset-based pagination
+    if page is not None:
+        offset = (page - 1) * limit
+
+    # Use page for response if provided, otherwise calculate from offset
+    response_page = page if page is not None else (offset // limit) + 1
+
+    async def build() -> EventsResponse:
+        # Build base query on the materialized latest events
+        # The total comes from a window count in the same scan as the page
+        total_column = "COUNT(*) OVER ()" if include_total else "NULL"
+        query = f"""
         SELECT 
-            venue, event_type, event_name, start_date_time, ticket_url, price
-        FROM (
-            SELECT 
-                venue, event_type, event_name, start_date_time, ticket_url, price, as_of_date,
-                ROW_NUMBER() OVER (
-                    PARTITION BY venue, event_name, start_date_time 
-                    ORDER BY as_of_date DESC
-                ) as rn
-            FROM events
-        )
-        WHERE rn = 1
+            venue, event_type, event_name, start_date_time, ticket_url, price,
+            {total_column} AS total
+        FROM events_latest
+        WHERE TRUE
         """
 
         filters = []
@@ -142,49 +391,77 @@ async def get_events(
             filters.append("event_type = ?")
             params["event_type"] = event_type
 
+        # Dates become a half-open [start 00:00, day after end 00:00) range on the raw
+        # timestamp column, so DuckDB can prune row groups by their min/max
         if start_date:
             try:
-                datetime.strptime(start_date, "%Y-%m-%d")
-                filters.append("CAST(start_date_time AS DATE) >= CAST(? AS DATE)")
-                params["start_date"] = start_date
+                params["start_date"] = local_midnight(start_date)
+                filters.append("start_date_time >= ?")
             except ValueError:
                 pass
 
         if end_date:
             try:
-                datetime.strptime(end_date, "%Y-%m-%d")
-                filters.append("CAST(start_date_time AS DATE) <= CAST(? AS DATE)")
-                params["end_date"] = end_date
+                params["end_date"] = local_midnight(end_date, days_after=1)
+                filters.append("start_date_time < ?")
             except ValueError:
                 pass
 
-        # Add search filter
+        # Add search filter: names are looked up in the in-process index
         if search:
-            filters.append("LOWER(event_name) LIKE LOWER(?)")
-            params["search"] = f"%{search}%"
+            names = await db.search(search)
+            if names is not None:
+                filters.append("event_name IN (SELECT UNNEST(?::VARCHAR[]))")
+                params["search"] = sorted(names)
+            else:
+                # No word characters to index on (e.g. "!!"): plain substring match
+                filters.append("LOWER(event_name) LIKE LOWER(?)")
+                params["search"] = f"%{search}%"
 
         # Append additional filters if they exist
         if filters:
             query += " AND " + " AND ".join(filters)
 
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM ({query})"
-        total = con.execute(
-            count_query,
-            [params.get(k) for k in ["venue", "event_type", "start_date", "end_date", "search"]
-             if k in params and params[k] is not None],
-        ).fetchone()[0]
-
-        # Add pagination
-        query += f" ORDER BY start_date_time ASC LIMIT ? OFFSET ?"
-
-        # Execute query with parameters
-        param_values = [params.get(k) for k in ["venue", "event_type", "start_date", "end_date", "search"]
-                        if k in params and params[k] is not None]
-        param_values.extend([limit, offset])
+        filter_values = [
+            params.get(k) for k in ["venue", "event_type", "start_date", "end_date", "search"]
+            if k in params and params[k] is not None
+        ]
 
-        result = con.execute(query, param_values).fetchall()
-        con.close()
+        # Add pagination: keyset after the cursor, otherwise offset
+        # (venue and event_name complete the sort key so ties have a stable order;
+        # events without a start time, only found in older database files, come last)
+        page_query = query
+        page_values = list(filter_values)
+        if after is not None:
+            after_start, after_venue, after_name = after
+            tie = "(venue > ? OR (venue = ? AND COALESCE(event_name, '') > ?))"
+            if after_start is None:
+                page_query += f" AND start_date_time IS NULL AND {tie}"
+                page_values += [after_venue, after_venue, after_name]
+            else:
+                page_query += f"""
+                AND (start_date_time >= ? OR start_date_time IS NULL)
+                AND (start_date_time > ? OR start_date_time IS NULL OR {tie})
+                """
+                page_values += [after_start, after_start, after_venue, after_venue, after_name]
+        page_query += (
+            " ORDER BY start_date_time ASC NULLS LAST, venue ASC, COALESCE(event_name, '') ASC"
+            " LIMIT ?"
+        )
+        page_values.append(limit)
+        if after is None:
+            page_query += " OFFSET ?"
+            page_values.append(offset)
+        result = await db.fetchall(page_query, page_values)
+
+        total = None
+        if result:
+            total = result[0][6]
+        elif include_total and (offset > 0 or after is not None):
+            # Page past the end: the window count has no row to ride on
+            (total,) = await db.fetchone(f"SELECT COUNT(*) FROM ({query})", filter_values)
+        elif include_total:
+            total = 0
 
         # Map results to Event objects
         events = [
@@ -199,52 +476,146 @@ async def get_events(
             for row in result
         ]
 
+        next_cursor = None
+        if len(result) == limit:
+            last = result[-1]
+            next_cursor = encode_cursor(last[3], last[0], last[2])
+
         return EventsResponse(
             total=total,
             page=response_page,
             limit=limit,
             events=events,
+            next_cursor=next_cursor,
         )
 
+    try:
+        key = (
+            "events", venue, event_type, start_date, end_date, search,
+            response_page, offset, cursor, limit, include_total,
+        )
+        return await cached_response(request, db, key, build)
+
     except Exception as e:
         import traceback
         traceback.print_exc()
         return EventsResponse(
-            total=0,
-            page=response_page if page is not None else (offset // limit) + 1,
+            total=0 if include_total else None,
+            page=response_page,
             limit=limit,
             events=[],
         )
 
 
 @app.get("/api/venues")
-async def get_venues() -> dict:
+async def get_venues(request: Request, db: DatabasePool = Depends(get_db_pool)) -> dict:
     """Get list of unique venues."""
-    try:
-        con = get_db_connection()
-        venues = con.execute(
-            "SELECT DISTINCT venue FROM events ORDER BY venue"
-        ).fetchall()
-        con.close()
+    async def build() -> dict:
+        venues = await db.fetchall("SELECT DISTINCT venue FROM events_latest ORDER BY venue")
         return {"venues": [v[0] for v in venues]}
+
+    try:
+        return await cached_response(request, db, ("venues",), build)
     except Exception as e:
         return {"venues": []}
 
 
 @app.get("/api/event-types")
-async def get_event_types() -> dict:
+async def get_event_types(request: Request, db: DatabasePool = Depends(get_db_pool)) -> dict:
     """Get list of unique event types."""
-    try:
-        con = get_db_connection()
-        types = con.execute(
-            "SELECT DISTINCT event_type FROM events ORDER BY event_type"
-        ).fetchall()
-        con.close()
+    async def build() -> dict:
+        types = await db.fetchall(
+            "SELECT DISTINCT event_type FROM events_latest ORDER BY event_type"
+        )
         return {"event_types": [t[0] for t in types]}
+
+    try:
+        return await cached_response(request, db, ("event_types",), build)
     except Exception as e:
         return {"event_types": []}
 
 
+@app.get("/api/facets", response_model=FacetsResponse)
+async def get_facets(
+    request: Request,
+    venue: str | None = Query(None, description="Filter by venue"),
+    event_type: str | None = Query(None, description="Filter by event type"),
+    start_date: str | None = Query(None, description="Filter by start date (YYYY-MM-DD)"),
+    end_date: str | None = Query(None, description="Filter by end date (YYYY-MM-DD)"),
+    search: str | None = Query(None, description="Search in event names"),
+    db: DatabasePool = Depends(get_db_pool),
+) -> FacetsResponse:
+    """Get all venues and event types with match counts, plus the overall date range.
+
+    Each facet's counts apply every filter except its own, so the venue list
+    shows how many events each venue would give for the other active filters.
+    """
+    async def build() -> FacetsResponse:
+        # Without a search the per-day aggregates suffice; search needs event names
+        if search:
+            source = "events_latest"
+            count_expr = "COUNT(*)"
+            day_expr = f"CAST(timezone('{LOCAL_TIMEZONE}', start_date_time) AS DATE)"
+        else:
+            source = "events_daily_counts"
+            count_expr = "SUM(events)"
+            day_expr = "day"
+
+        # (facet the condition belongs to, SQL, parameters)
+        conditions: list[tuple[str | None, str, list[Any]]] = []
+        if venue:
+            conditions.append(("venue", "venue = ?", [venue]))
+        if event_type:
+            conditions.append(("event_type", "event_type = ?", [event_type]))
+        for day, op in ((start_date, ">="), (end_date, "<=")):
+            if day:
+                try:
+                    conditions.append(
+                        (None, f"{day_expr} {op} ?", [datetime.strptime(day, "%Y-%m-%d").date()])
+                    )
+                except ValueError:
+                    pass
+        if search:
+            names = await db.search(search)
+            if names is not None:
+                conditions.append(
+                    (None, "event_name IN (SELECT UNNEST(?::VARCHAR[]))", [sorted(names)])
+                )
+            else:
+                conditions.append((None, "LOWER(event_name) LIKE LOWER(?)", [f"%{search}%"]))
+
+        facets = {}
+        for facet in ("venue", "event_type"):
+            applied = [c for c in conditions if c[0] != facet]
+            where = " AND ".join(c[1] for c in applied) or "TRUE"
+            rows = await db.fetchall(
+                f"""
+                SELECT {facet}, COALESCE({count_expr} FILTER (WHERE {where}), 0)
+                FROM {source}
+                GROUP BY {facet}
+                ORDER BY {facet}
+                """,
+                [p for c in applied for p in c[2]],
+            )
+            facets[facet] = [FacetValue(value=r[0], count=r[1]) for r in rows if r[0]]
+
+        min_day, max_day = await db.fetchone("SELECT MIN(day), MAX(day) FROM events_daily_counts")
+        return FacetsResponse(
+            venues=facets["venue"],
+            event_types=facets["event_type"],
+            min_date=min_day.isoformat() if min_day else None,
+            max_date=max_day.isoformat() if max_day else None,
+        )
+
+    try:
+        key = ("facets", venue, event_type, start_date, end_date, search)
+        return await cached_response(request, db, key, build)
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return FacetsResponse(venues=[], event_types=[], min_date=None, max_date=None)
+
+
 if __name__ == "__main__":
     import uvicorn
 
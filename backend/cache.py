@@ -0,0 +1,62 @@
+"""In-memory response cache for the CultHeld API."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    created: float
+
+
+class ResponseCache:
+    """LRU cache of rendered response bodies with a time-to-live.
+
+    Callers put the database generation in the key, so entries rendered from
+    an older database file are simply never looked up again and age out.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """Return the cached response for `key`, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, body: bytes) -> CachedResponse:
+        """Store `body` under `key` with a strong ETag derived from its bytes."""
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = CachedResponse(body=body, etag=etag, created=time.monotonic())
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,78 @@
+"""In-process search index over event names for the CultHeld API."""
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections.abc import Iterable
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so "Carré" and "carre" compare equal."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into normalized word tokens."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+class SearchIndex:
+    """Inverted index from name tokens to event names, with prefix matching.
+
+    A query matches a name when every query token is a prefix of some token in
+    the name: "carre kerst" matches "Kerstconcert in Carré", while "circus"
+    does not match "Wereldkerstcircus".
+    """
+
+    def __init__(self):
+        self._postings: dict[str, set[str]] = {}
+        self._tokens: list[str] = []
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def update(self, names: Iterable[str]) -> None:
+        """Make the index cover exactly `names`, touching only added/removed ones."""
+        names = {n for n in names if n}
+        with self._lock:
+            added = names - self._names
+            removed = self._names - names
+            for name in removed:
+                for token in set(tokenize(name)):
+                    postings = self._postings.get(token)
+                    if postings is not None:
+                        postings.discard(name)
+                        if not postings:
+                            del self._postings[token]
+            for name in added:
+                for token in set(tokenize(name)):
+                    self._postings.setdefault(token, set()).add(name)
+            if added or removed:
+                self._tokens = sorted(self._postings)
+            self._names = names
+
+    def search(self, query: str) -> set[str] | None:
+        """Return the event names matching `query`, or None if it has no tokens."""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return None
+
+        with self._lock:
+            result: set[str] | None = None
+            for query_token in query_tokens:
+                matches: set[str] = set()
+                start = bisect.bisect_left(self._tokens, query_token)
+                for token in self._tokens[start:]:
+                    if not token.startswith(query_token):
+                        break
+                    matches |= self._postings[token]
+                result = matches if result is None else result & matches
+                if not result:
+                    break
+            return result
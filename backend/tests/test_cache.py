@@ -0,0 +1,109 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+import app as backend
+import cache
+from cache import ResponseCache, etag_matches
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock):
+    responses = ResponseCache(ttl=60)
+    responses.put("a", b"{}")
+
+    clock.now += 60
+    assert responses.get("a").body == b"{}"
+    clock.now += 1
+    assert responses.get("a") is None
+    assert len(responses) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    responses = ResponseCache(maxsize=2)
+    responses.put("a", b"1")
+    responses.put("b", b"2")
+    responses.get("a")
+    responses.put("c", b"3")
+
+    assert responses.get("b") is None
+    assert responses.get("a").body == b"1"
+    assert responses.get("c").body == b"3"
+
+
+def test_etag_depends_only_on_the_body():
+    responses = ResponseCache()
+
+    assert responses.put("a", b"x").etag == responses.put("b", b"x").etag
+    assert responses.put("a", b"x").etag != responses.put("a", b"y").etag
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('"other", "abc"', True),
+    ('"other"', False),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+@pytest.fixture
+def client(tmp_path):
+    db_file = tmp_path / "events.duckdb"
+    con = duckdb.connect(str(db_file))
+    con.execute("""
+        CREATE TABLE events AS
+        SELECT 'Paradiso' AS venue, 'Concert' AS event_type, 'Band A' AS event_name,
+               TIMESTAMPTZ '2025-12-20 19:00:00+00' AS start_date_time,
+               DATE '2025-12-16' AS as_of_date
+    """)
+    con.close()
+
+    pool = backend.DatabasePool(db_file)
+    backend.app.dependency_overrides[backend.get_db_pool] = lambda: pool
+    backend.response_cache.clear()
+    yield TestClient(backend.app)
+    backend.app.dependency_overrides.clear()
+    backend.response_cache.clear()
+    pool.close()
+
+
+def test_matching_if_none_match_gets_304(client):
+    first = client.get("/api/venues")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert first.json() == {"venues": ["Paradiso"]}
+    assert first.headers["cache-control"] == f"public, max-age={backend.CACHE_MAX_AGE}"
+
+    revalidated = client.get("/api/venues", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    stale = client.get("/api/venues", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.json() == {"venues": ["Paradiso"]}
@@ -0,0 +1,160 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT.parent / "data_acquisition"))
+
+import duckdb
+import pandas as pd
+import pytest
+from core.transform import write_core_batch
+from fastapi.testclient import TestClient
+
+import app as backend
+
+EVENTS = [
+    # Ties on start time (across and within venues) exercise the full sort key
+    ("Paradiso", "Band A", "2025-12-20 20:00"),
+    ("Paradiso", "Band B", "2025-12-20 20:00"),
+    ("Melkweg", "Band C", "2025-12-20 20:00"),
+    ("Melkweg", "Band D", "2025-12-21 19:30"),
+    ("Carré", "Show E", "2025-12-21 19:30"),
+    ("Paradiso", "Band F", "2025-12-22 21:00"),
+    ("Melkweg", "Band G", "2025-12-23 20:00"),
+]
+
+
+def _frames(events):
+    return [
+        pd.DataFrame([{
+            "venue": venue,
+            "event_type": "Concert",
+            "event_name": name,
+            "start_date_time": start,
+            "ticket_url": f"https://example/{name}",
+            "price": 10.0,
+        }])
+        for venue, name, start in events
+    ]
+
+
+@pytest.fixture
+def serve(tmp_path):
+    """Serve a database file through the API; returns a TestClient."""
+    pools = []
+
+    def serve(db_file):
+        pool = backend.DatabasePool(db_file)
+        pools.append(pool)
+        backend.app.dependency_overrides[backend.get_db_pool] = lambda: pool
+        return TestClient(backend.app)
+
+    yield serve
+    backend.app.dependency_overrides.clear()
+    for pool in pools:
+        pool.close()
+
+
+@pytest.fixture
+def client(tmp_path, serve):
+    db_file = tmp_path / "events.duckdb"
+    write_core_batch(
+        _frames(EVENTS), as_of_date="2025-12-16", history_model="snapshot", db_file=db_file
+    )
+    return serve(db_file)
+
+
+def _keys(events):
+    return [(e["venue"], e["event_name"], e["start_date_time"]) for e in events]
+
+
+def _walk_offsets(client, limit):
+    rows = []
+    for offset in range(0, 100, limit):
+        events = client.get("/api/events", params={"limit": limit, "offset": offset}).json()
+        if not events["events"]:
+            return rows
+        rows += _keys(events["events"])
+    raise AssertionError("offset paging did not end")
+
+
+def _walk_cursor(client, limit):
+    rows = []
+    params = {"limit": limit}
+    for _ in range(100):
+        body = client.get("/api/events", params=params).json()
+        rows += _keys(body["events"])
+        if body["next_cursor"] is None:
+            return rows
+        params = {"limit": limit, "cursor": body["next_cursor"], "include_total": False}
+    raise AssertionError("cursor paging did not end")
+
+
+def test_cursor_pages_match_offset_pages(client):
+    by_offset = _walk_offsets(client, 2)
+
+    assert len(by_offset) == len(EVENTS)
+    assert _walk_cursor(client, 2) == by_offset
+    assert len(set(by_offset)) == len(EVENTS)
+
+
+def test_unresolvable_start_times_are_not_served(tmp_path, serve):
+    db_file = tmp_path / "events.duckdb"
+    events = EVENTS[:2] + [
+        ("Melkweg", "Band X", "TBA"),
+        ("Melkweg", "Band Y", "2025-10-26 02:30"),  # occurs twice when DST ends
+    ]
+    write_core_batch(
+        _frames(events), as_of_date="2025-12-16", history_model="snapshot", db_file=db_file
+    )
+    client = serve(db_file)
+
+    assert _walk_cursor(client, 3) == _walk_offsets(client, 3) == [
+        ("Paradiso", "Band A", "2025-12-20 20:00:00+01:00"),
+        ("Paradiso", "Band B", "2025-12-20 20:00:00+01:00"),
+    ]
+
+
+def test_null_start_times_in_older_files_sort_last(tmp_path, serve):
+    db_file = tmp_path / "events.duckdb"
+    con = duckdb.connect(str(db_file))
+    con.execute("""
+        CREATE TABLE events AS
+        SELECT venue, 'Concert' AS event_type, event_name,
+               CAST(start_date_time AS TIMESTAMPTZ) AS start_date_time,
+               'https://example/event' AS ticket_url, 10.0 AS price,
+               DATE '2025-12-16' AS as_of_date
+        FROM (VALUES
+            ('Paradiso', 'Band A', '2025-12-20 19:00:00+00'),
+            ('Melkweg', 'Band B', NULL),
+            ('Paradiso', 'Band C', '2025-12-21 19:00:00+00'),
+            ('Carré', 'Show D', NULL)
+        ) AS t(venue, event_name, start_date_time)
+    """)
+    con.close()
+    client = serve(db_file)
+
+    by_offset = _walk_offsets(client, 3)
+    assert [key[1] for key in by_offset] == ["Band A", "Band C", "Show D", "Band B"]
+    assert _walk_cursor(client, 3) == by_offset
+    assert _walk_cursor(client, 1) == by_offset
+
+
+def test_cursor_round_trips_the_sort_key():
+    start = backend.local_midnight("2025-12-20")
+    cursor = backend.encode_cursor(start, "Carré", None)
+
+    assert backend.decode_cursor(cursor) == (start, "Carré", "")
+    assert backend.decode_cursor(backend.encode_cursor(None, "Carré", "Show")) == (
+        None, "Carré", "Show"
+    )
+
+
+# Not base64, a key of the wrong length ([1]) and a key with a bad timestamp (["soon", "x", "y"])
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzFd", "WyJzb29uIiwgIngiLCAieSJd"])
+def test_malformed_cursor_is_rejected(client, cursor):
+    resp = client.get("/api/events", params={"cursor": cursor})
+
+    assert resp.status_code == 400
+    assert "Invalid cursor" in resp.json()["detail"]
@@ -0,0 +1,56 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from search import SearchIndex, tokenize
+
+NAMES = ["Kerstconcert in Carré", "Wereldkerstcircus", "Carmen", "Nacht van de Kerst"]
+
+
+def _index(names=NAMES):
+    index = SearchIndex()
+    index.update(names)
+    return index
+
+
+def test_tokens_are_lowercased_and_stripped_of_accents():
+    assert tokenize("Kerstconcert in CARRÉ!") == ["kerstconcert", "in", "carre"]
+
+
+def test_accents_are_ignored_on_both_sides():
+    index = _index()
+
+    assert index.search("carre") == {"Kerstconcert in Carré"}
+    assert index.search("Carré") == {"Kerstconcert in Carré"}
+
+
+def test_every_query_token_must_prefix_a_name_token():
+    index = _index()
+
+    assert index.search("car") == {"Kerstconcert in Carré", "Carmen"}
+    assert index.search("carre kerst") == {"Kerstconcert in Carré"}
+    assert index.search("kerst") == {"Kerstconcert in Carré", "Nacht van de Kerst"}
+    # Only prefixes match: "circus" is inside "wereldkerstcircus", not at its start
+    assert index.search("circus") == set()
+    assert index.search("carmen kerst") == set()
+
+
+def test_query_without_tokens_is_none():
+    index = _index()
+
+    assert index.search("") is None
+    assert index.search("!! -") is None
+
+
+def test_update_drops_names_that_disappear():
+    index = _index()
+    index.update(["Carmen", "Nacht van de Kerst", "Kerstmarkt", None])
+
+    assert len(index) == 3
+    assert index.search("carre") == set()
+    assert index.search("kerst") == {"Nacht van de Kerst", "Kerstmarkt"}
+    assert index.search("wereld") == set()
+    # Tokens only used by removed names are gone from the index altogether
+    assert "carre" not in index._postings
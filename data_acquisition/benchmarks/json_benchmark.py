@@ -0,0 +1,98 @@
+"""Benchmark decoding a Melkweg agenda payload into the raw frame.
+
+Compares the old json.loads -> json.dumps -> pd.read_json round trip with
+`http_utils.json_records` (one orjson parse, explicit schema).
+
+Usage (from data_acquisition/):
+    python -m benchmarks.json_benchmark [--events 2000]
+    python -m benchmarks.json_benchmark --payload agenda.json   # a recorded response body
+"""
+
+import argparse
+import json
+import time
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from config import melkweg as melkweg_config
+from utils.http_utils import json_path, json_records
+
+
+def synthetic_payload(events: int) -> bytes:
+    """A body shaped like Melkweg's `/_next/data/<build>/nl/agenda.json`."""
+    items = [
+        {
+            'id': i,
+            'attributes': {
+                'title': f'Artist {i} + Support',
+                'name': f'Artist {i}',
+                'summary': 'Indie rock from somewhere far away. ' * 4,
+                'startDate': f'2026-{1 + i % 12:02d}-{1 + i % 28:02d}T20:00:00+01:00',
+                'uri': f'nl/agenda/artist-{i}',
+                'price': None if i % 5 == 0 else f'€ {10 + i % 30},50',
+                'genres': [{'id': g, 'title': f'genre {g}'} for g in range(i % 3)],
+                'room': {'id': i % 4, 'name': f'Room {i % 4}'},
+                'soldOut': i % 7 == 0,
+            },
+        }
+        for i in range(events)
+    ]
+    content = [{'attributes': {'initialEvents': items}}]
+    return json.dumps({'pageProps': {'pageData': {'attributes': {'content': content}}}}).encode()
+
+
+def _response(body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.encoding = 'utf-8'
+    return resp
+
+
+def round_trip(resp: requests.Response) -> pd.DataFrame:
+    """The previous staging code path."""
+    json_data = json.loads(resp.text)
+    out = [x['attributes'] for x in json_path(json_data, melkweg_config.EVENTS_PATH)]
+    return pd.read_json(StringIO(json.dumps(out)))
+
+
+def single_pass(resp: requests.Response) -> pd.DataFrame:
+    return json_records(
+        resp,
+        melkweg_config.EVENTS_PATH,
+        melkweg_config.EVENT_SCHEMA,
+        item_path=melkweg_config.EVENT_ITEM_PATH,
+    )
+
+
+def _best(func, body: bytes, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        resp = _response(body)
+        start = time.perf_counter()
+        func(resp)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--payload', type=Path, default=None, help='recorded response body')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    body = args.payload.read_bytes() if args.payload else synthetic_payload(args.events)
+    rows = len(single_pass(_response(body)))
+    old = _best(round_trip, body, args.repeat)
+    new = _best(single_pass, body, args.repeat)
+    print(f'{rows} events, {len(body) / 1e6:.1f} MB')
+    print(f'  loads/dumps/read_json: {old * 1000:>8.1f} ms')
+    print(f'  json_records (orjson): {new * 1000:>8.1f} ms ({old / new:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark row-wise vs column-wise mapping on a synthetic frame.
+
+Usage (from data_acquisition/):
+    python -m benchmarks.mapping_benchmark [--rows 100000] [--venue carre]
+"""
+
+import argparse
+import importlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.column_mapping import apply_column_mapping, apply_row_mapping
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw rows shaped like the scrapers' output, with some missing and messy values."""
+    rng = np.random.default_rng(seed)
+    idx = np.arange(rows)
+    titles = pd.Series([f'Event {i}' for i in idx], dtype=object)
+    titles[rng.random(rows) < 0.05] = None
+    prices = pd.Series([f'€ {p:.2f}'.replace('.', ',') for p in rng.uniform(5, 80, rows)])
+    prices[rng.random(rows) < 0.2] = ''
+    start = pd.Timestamp('2025-01-01 19:00') + pd.to_timedelta(idx % 365, unit='D')
+    return pd.DataFrame(
+        {
+            'title': titles,
+            'name': [f'name {i}' for i in idx],
+            'start_date_time': start.strftime('%Y-%m-%d %H:%M'),
+            'startDateTime': start.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ticket_url': [f'https://tickets.example/{i}' for i in idx],
+            'uri': [f'agenda/{i}' for i in idx],
+            'price': prices.astype(object),
+        }
+    )
+
+
+def _rate(func, df: pd.DataFrame, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return len(df) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--venue', default='carre', help='mapping module, e.g. carre or melkweg')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    module = importlib.import_module(f'mapping.{args.venue}_mapping')
+    map_func = getattr(module, f'map_{args.venue}')
+    df = synthetic_frame(args.rows)
+
+    row_rate = _rate(lambda d: apply_row_mapping(d, map_func), df, args.repeat)
+    col_rate = _rate(lambda d: apply_column_mapping(d, module.COLUMN_MAPPING), df, args.repeat)
+    print(f'{args.venue}: {args.rows} rows')
+    print(f'  row mapping:    {row_rate:>12,.0f} rows/s')
+    print(f'  column mapping: {col_rate:>12,.0f} rows/s ({col_rate / row_rate:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,3 +12,13 @@ PRICE_REQUIRED_VENUES: set[str] = {
 	'FCHYENA',
 	'De Balie',
 }
+
+# How the core database keeps history (see core.transform.write_core_batch):
+# "snapshot" stores every venue's full event list per scrape date in `events`;
+# "scd2" stores validity intervals in `events_history`, adding rows only on changes.
+# Switch an existing database with `python -m core.migrate scd2`.
+HISTORY_MODEL: str = 'snapshot'
+
+# Raw Parquet snapshots kept per venue in data/staging (see utils.staging_utils);
+# older ones are deleted after each scrape. None keeps every snapshot.
+STAGING_KEEP_SNAPSHOTS: int | None = 14
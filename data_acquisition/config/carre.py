@@ -7,3 +7,18 @@ HEADERS = {
     "Accept": "application/json",
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15",
 }
+
+# Production API responses younger than this many seconds are served from the HTTP cache
+# without revalidation (only applies when the cache is enabled, see run_all.py)
+HTTP_CACHE_MAX_AGE = 6 * 60 * 60
+
+# Detail production API responses are only refetched when their listing entry changed, or
+# when the stored copy is older than this many hours
+DETAIL_REFRESH_HOURS = 3 * 24
+
+# At most this many production pages whose API fetch failed are rendered in the browser
+# fallback per run; the rest are retried through the API on the next run
+MAX_RENDERED_PAGES = 20
+
+# Lists every production page (/voorstelling/<slug>); used to discover productions
+SITEMAP_URL = "https://carre.nl/sitemap.xml"
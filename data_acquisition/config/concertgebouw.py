@@ -16,3 +16,11 @@ SEARCH_PARAMS = {
 
 # Limit number of events to fetch (to avoid too many API calls)
 EVENT_LIMIT = 250
+
+# Concert pages younger than this many seconds are served from the HTTP cache
+# without revalidation (only applies when the cache is enabled, see run_all.py)
+HTTP_CACHE_MAX_AGE = 12 * 60 * 60
+
+# Detail event pages are only refetched when their listing entry changed, or
+# when the stored copy is older than this many hours
+DETAIL_REFRESH_HOURS = 7 * 24
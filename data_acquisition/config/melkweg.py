@@ -8,6 +8,22 @@ QUERY_PARAMS = {
     "slug": ["nl", "agenda"]
 }
 
+# JSON path of the event list in the agenda data, and of the record inside each event
+EVENTS_PATH = "pageProps.pageData.attributes.content[0].attributes.initialEvents"
+EVENT_ITEM_PATH = "attributes"
+
+# Column dtypes of the fields the mapping reads; other fields are kept as object columns
+EVENT_SCHEMA = {
+    "title": "object",
+    "name": "object",
+    "summary": "object",
+    "startDateTime": "object",
+    "startDate": "object",
+    "uri": "object",
+    "url": "object",
+    "price": "object",
+}
+
 HEADERS = {
     "Accept": "*/*",
     "Sec-Fetch-Site": "same-origin",
@@ -33,6 +49,3 @@ COOKIES = {
     "_gat_UA-40003495-1": "1",
     "_gid": "GA1.2.674701786.1691517650"
 }
-
-# Fallback build ID if auto-fetch fails (update as needed)
-FALLBACK_BUILD_ID = "iMEO0fwvv6V7jsOgcjB4m"
@@ -56,26 +56,50 @@ query programItemsQuery(
             price
             sort
             eventStatus
-            highlight
-            supportAct
             announceSupport
             soldOut
             location {
                 id
                 title
             }
-            image {
-                desktop
-            }
         }
     }
 }
 """
 
+# Column dtypes of the raw frame, one column per field of the query above
+EVENT_SCHEMA = {
+    "id": "object",
+    "uri": "object",
+    "title": "object",
+    "startDateTime": "object",
+    "date": "object",
+    "subtitle": "object",
+    "price": "object",
+    "sort": "object",
+    "eventStatus": "object",
+    "announceSupport": "boolean",
+    "soldOut": "boolean",
+    "location": "object",
+}
+
+# Events per GraphQL page; pages are requested (via searchAfter) until the programme is exhausted
+PAGE_SIZE = 100
+
+# Rolling window of start dates requested, counted from the day of the run
+WINDOW_DAYS = 365
+
+# Stop paginating after this many pages, in case the cursor never runs out
+MAX_PAGES = 50
+
+# Seconds to wait for one page
+TIMEOUT = 20
+
+# Base variables; the date window and searchAfter cursor are filled in per request
 VARIABLES = {
     "site": "paradisoEnglish",
-    "size": 50,
-    "gteStartDateTime": "2025-12-15",
+    "size": PAGE_SIZE,
+    "gteStartDateTime": None,
     "lteStartDateTime": None,
     "searchAfter": None,
     "location": None,
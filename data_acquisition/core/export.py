@@ -0,0 +1,261 @@
+"""Export the core events database to a Parquet history store and a serving database.
+
+Usage (from the data_acquisition directory):
+
+    python -m core.export            # history + serving database
+    python -m core.export history    # only the Parquet history
+    python -m core.export history --keep-days 30
+"""
+
+import argparse
+import os
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+import duckdb
+
+from config import HISTORY_MODEL
+from core.transform import DAILY_COUNTS_TABLE, DB_FILE, HISTORY_TABLE, LATEST_TABLE
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Hive-partitioned history: data/history/as_of_date=YYYY-MM-DD/venue=<venue>/events_0.parquet
+HISTORY_DIR = Path("data/history")
+
+# SCD2 history (HISTORY_MODEL = "scd2"): data/history_scd2/venue=<venue>/events_0.parquet
+SCD2_HISTORY_DIR = Path("data/history_scd2")
+
+# Small database holding only what the API serves; deploy this as backend/events.duckdb
+SERVING_DB_FILE = Path("data/serving/events.duckdb")
+
+
+def history_glob(history_dir: Path = HISTORY_DIR, history_model: str = "snapshot") -> str:
+    if history_model == "scd2":
+        return str(history_dir / "*" / "*.parquet")
+    return str(history_dir / "*" / "*" / "*.parquet")
+
+
+def history_query(history_dir: Path = HISTORY_DIR, history_model: str = "snapshot") -> str:
+    """SQL relation over the Parquet history.
+
+    Filters on `as_of_date` and `venue` only open the matching partitions, e.g.
+    `SELECT ... FROM {history_query()} WHERE as_of_date >= DATE '2025-12-01'`.
+    """
+    glob = history_glob(history_dir, history_model)
+    return f"read_parquet('{glob}', hive_partitioning = true)"
+
+
+def export_history(
+    db_file: Path = DB_FILE,
+    history_dir: Path | None = None,
+    as_of_dates: list[str] | None = None,
+    table_name: str = "events",
+    history_model: str | None = None,
+) -> list[str]:
+    """
+    Write history snapshots to ZSTD-compressed Parquet, partitioned by as_of_date and venue.
+
+    Each exported as_of_date partition is replaced as a whole, so re-running an
+    export after a same-day re-scrape leaves no stale venue files behind. With
+    the "scd2" history model the intervals table is exported instead (see
+    `export_scd2_history`).
+
+    Args:
+        db_file: Core DuckDB file to read
+        history_dir: Root directory of the Parquet history (default depends on the model)
+        as_of_dates: Snapshots to export; by default every snapshot that has no
+            partition yet, plus the most recent one (it may have been re-scraped)
+        table_name: History table to read from
+        history_model: "snapshot" or "scd2" (defaults to config.HISTORY_MODEL)
+
+    Returns:
+        The exported as_of_dates (venues for scd2)
+    """
+    history_model = history_model or HISTORY_MODEL
+    if history_model == "scd2":
+        return export_scd2_history(db_file, history_dir or SCD2_HISTORY_DIR)
+    history_dir = history_dir or HISTORY_DIR
+
+    con = duckdb.connect(database=str(db_file), read_only=True)
+    try:
+        available = [
+            str(r[0]) for r in con.execute(
+                f"SELECT DISTINCT CAST(as_of_date AS VARCHAR) FROM {table_name} ORDER BY 1"
+            ).fetchall()
+        ]
+        if as_of_dates is None:
+            as_of_dates = [
+                d for d in available
+                if d == available[-1] or not (history_dir / f"as_of_date={d}").exists()
+            ]
+        else:
+            as_of_dates = [d for d in as_of_dates if d in available]
+        if not as_of_dates:
+            logger.info("Parquet history is up to date")
+            return []
+
+        history_dir.mkdir(parents=True, exist_ok=True)
+        for d in as_of_dates:
+            shutil.rmtree(history_dir / f"as_of_date={d}", ignore_errors=True)
+        con.execute(
+            f"""
+            COPY (
+                SELECT * FROM {table_name}
+                WHERE list_contains(?, CAST(as_of_date AS VARCHAR))
+                ORDER BY venue, start_date_time
+            ) TO '{history_dir}' (
+                FORMAT PARQUET,
+                PARTITION_BY (as_of_date, venue),
+                COMPRESSION ZSTD,
+                OVERWRITE_OR_IGNORE,
+                FILENAME_PATTERN 'events_{{i}}'
+            )
+            """,
+            [as_of_dates],
+        )
+    finally:
+        con.close()
+
+    logger.info(f"Exported {len(as_of_dates)} snapshots to {history_dir}: {as_of_dates}")
+    return as_of_dates
+
+
+def export_scd2_history(
+    db_file: Path = DB_FILE,
+    history_dir: Path = SCD2_HISTORY_DIR,
+    table_name: str = HISTORY_TABLE,
+) -> list[str]:
+    """
+    Write the SCD2 history table to ZSTD-compressed Parquet, partitioned by venue.
+
+    Closing a version updates its valid_to, so earlier files go stale: the
+    table (compact, one row per version) is rewritten as a whole into a
+    temporary directory that then replaces `history_dir`.
+
+    Returns:
+        The exported venues
+    """
+    tmp_dir = history_dir.with_name(history_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    con = duckdb.connect(database=str(db_file), read_only=True)
+    try:
+        venues = [
+            r[0] for r in con.execute(
+                f"SELECT DISTINCT venue FROM {table_name} ORDER BY 1"
+            ).fetchall()
+        ]
+        if venues:
+            con.execute(f"""
+                COPY (
+                    SELECT * FROM {table_name} ORDER BY venue, valid_from, start_date_time
+                ) TO '{tmp_dir}' (
+                    FORMAT PARQUET,
+                    PARTITION_BY (venue),
+                    COMPRESSION ZSTD,
+                    FILENAME_PATTERN 'events_{{i}}'
+                )
+            """)
+    finally:
+        con.close()
+    if not venues:
+        logger.info(f"{table_name} is empty; nothing to export")
+        return []
+
+    shutil.rmtree(history_dir, ignore_errors=True)
+    os.replace(tmp_dir, history_dir)
+    logger.info(f"Exported {table_name} for {len(venues)} venues to {history_dir}")
+    return venues
+
+
+def prune_history(
+    keep_days: int,
+    db_file: Path = DB_FILE,
+    history_dir: Path = HISTORY_DIR,
+    table_name: str = "events",
+    history_model: str | None = None,
+) -> int:
+    """
+    Delete snapshots older than `keep_days` from the DuckDB history table.
+
+    Only snapshots that already have a Parquet partition are deleted, so no
+    history is lost. Returns the number of deleted rows. Not available for
+    the "scd2" history model, which stores one row per version, not per day.
+    """
+    if (history_model or HISTORY_MODEL) == "scd2":
+        raise ValueError(
+            "prune_history only applies to the snapshot history model; "
+            "the scd2 history has no per-day snapshots to drop"
+        )
+    cutoff = (date.today() - timedelta(days=keep_days)).isoformat()
+    exported = [
+        p.name.split("=", 1)[1] for p in history_dir.glob("as_of_date=*") if p.is_dir()
+    ]
+    con = duckdb.connect(database=str(db_file))
+    try:
+        deleted = con.execute(
+            f"""
+            DELETE FROM {table_name}
+            WHERE CAST(as_of_date AS VARCHAR) < ?
+              AND list_contains(?, CAST(as_of_date AS VARCHAR))
+            """,
+            [cutoff, exported],
+        ).fetchone()[0]
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    logger.info(f"Pruned {deleted} rows older than {cutoff} from {table_name}")
+    return deleted
+
+
+def export_serving_db(db_file: Path = DB_FILE, out_file: Path = SERVING_DB_FILE) -> Path:
+    """
+    Write a database with only the tables the API reads (latest events and daily counts).
+
+    The file is built next to `out_file` and moved into place atomically, so a
+    running backend never sees a half-written file.
+    """
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = out_file.with_name(out_file.name + ".tmp")
+    tmp_file.unlink(missing_ok=True)
+
+    con = duckdb.connect(database=str(tmp_file))
+    try:
+        con.execute(f"ATTACH '{db_file}' AS core (READ_ONLY)")
+        con.execute(
+            f"CREATE TABLE {LATEST_TABLE} AS "
+            f"SELECT * FROM core.{LATEST_TABLE} ORDER BY start_date_time"
+        )
+        con.execute(
+            f"CREATE TABLE {DAILY_COUNTS_TABLE} AS SELECT * FROM core.{DAILY_COUNTS_TABLE}"
+        )
+        rows = con.execute(f"SELECT COUNT(*) FROM {LATEST_TABLE}").fetchone()[0]
+        con.execute("DETACH core")
+    finally:
+        con.close()
+
+    os.replace(tmp_file, out_file)
+    logger.info(f"Wrote serving database {out_file} ({rows} events)")
+    return out_file
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "target", nargs="?", choices=["all", "history", "serving"], default="all"
+    )
+    parser.add_argument(
+        "--keep-days",
+        type=int,
+        default=None,
+        help="After exporting, drop snapshots older than this from events.duckdb "
+        "(snapshot history model only)",
+    )
+    args = parser.parse_args()
+    if args.target in ("all", "history"):
+        export_history()
+        if args.keep_days is not None:
+            prune_history(args.keep_days)
+    if args.target in ("all", "serving"):
+        export_serving_db()
@@ -0,0 +1,125 @@
+"""One-off migrations of the core events database.
+
+Usage (from the data_acquisition directory):
+
+    python -m core.migrate timestamptz
+    python -m core.migrate scd2
+"""
+
+import argparse
+
+import duckdb
+
+from core.transform import (
+    DB_FILE,
+    HISTORY_TABLE,
+    SCD2_KEY,
+    SCD2_TRACKED,
+    migrate_start_date_time,
+    refresh_daily_counts,
+    refresh_latest_events,
+)
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def migrate_timestamptz(db_file=DB_FILE, table_name: str = "events") -> None:
+    """Store start_date_time as TIMESTAMPTZ and rebuild the latest-events table."""
+    con = duckdb.connect(database=str(db_file))
+    try:
+        if migrate_start_date_time(con, table_name):
+            refresh_latest_events(con, table_name=table_name)
+        else:
+            logger.info(f"{table_name}.start_date_time is already TIMESTAMPTZ")
+    finally:
+        con.close()
+
+
+def migrate_scd2(
+    db_file=DB_FILE, table_name: str = "events", history_table: str = HISTORY_TABLE
+) -> None:
+    """
+    Build the SCD2 history table from the daily snapshots in `table_name`.
+
+    Consecutive snapshots of a venue in which an event is present with the same
+    tracked columns collapse into one row. valid_to is the venue's next snapshot
+    date after that run (when the event had changed or disappeared), or NULL if
+    the run reaches the venue's latest snapshot. The snapshot table is left in
+    place; drop it once the history has been checked (and exported to Parquet).
+    Set config.HISTORY_MODEL = "scd2" so the pipeline writes to the new table.
+    """
+    key = ", ".join(SCD2_KEY)
+    event_key = ", ".join(f"e.{c}" for c in SCD2_KEY)
+    changed = " OR ".join(f"{c} IS DISTINCT FROM LAG({c}) OVER w" for c in SCD2_TRACKED)
+    con = duckdb.connect(database=str(db_file))
+    try:
+        exists = con.execute(
+            "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = ?", [history_table]
+        ).fetchone()[0]
+        if exists:
+            logger.info(f"{history_table} already exists; nothing to migrate")
+            return
+
+        migrate_start_date_time(con, table_name)
+        con.begin()
+        con.execute(f"""
+            CREATE TABLE {history_table} AS
+            WITH venue_days AS (
+                SELECT venue, day,
+                       ROW_NUMBER() OVER (PARTITION BY venue ORDER BY day) AS day_no,
+                       LEAD(day) OVER (PARTITION BY venue ORDER BY day) AS next_day
+                FROM (SELECT DISTINCT venue, CAST(as_of_date AS DATE) AS day FROM {table_name})
+            ),
+            versions AS (
+                SELECT e.venue, e.event_type, e.event_name, e.start_date_time, e.ticket_url,
+                       TRY_CAST(e.price AS DOUBLE) AS price, d.day, d.day_no, d.next_day
+                FROM {table_name} AS e
+                JOIN venue_days AS d
+                  ON d.venue = e.venue AND d.day = CAST(e.as_of_date AS DATE)
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY {event_key}, d.day) = 1
+            ),
+            runs AS (
+                SELECT *,
+                       SUM(starts_run) OVER (
+                           PARTITION BY {key} ORDER BY day_no ROWS UNBOUNDED PRECEDING
+                       ) AS run
+                FROM (
+                    SELECT *,
+                           CASE WHEN LAG(day_no) OVER w = day_no - 1 AND NOT ({changed})
+                                THEN 0 ELSE 1 END AS starts_run
+                    FROM versions
+                    WINDOW w AS (PARTITION BY {key} ORDER BY day_no)
+                )
+            )
+            SELECT venue, ANY_VALUE(event_type) AS event_type, event_name, start_date_time,
+                   ANY_VALUE(ticket_url) AS ticket_url, ANY_VALUE(price) AS price,
+                   MIN(day) AS valid_from, ARG_MAX_NULL(next_day, day_no) AS valid_to
+            FROM runs
+            GROUP BY {key}, run
+            ORDER BY venue, valid_from, start_date_time
+        """)
+        refresh_latest_events(
+            con, table_name=history_table, order_column="valid_from", current_only=True
+        )
+        refresh_daily_counts(con)
+        con.commit()
+        snapshots, versions = con.execute(
+            f"SELECT (SELECT COUNT(*) FROM {table_name}), (SELECT COUNT(*) FROM {history_table})"
+        ).fetchone()
+        logger.info(f"Built {history_table}: {snapshots} snapshot rows -> {versions} versions")
+    finally:
+        con.close()
+
+
+MIGRATIONS = {
+    "timestamptz": migrate_timestamptz,
+    "scd2": migrate_scd2,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("migration", choices=sorted(MIGRATIONS))
+    args = parser.parse_args()
+    MIGRATIONS[args.migration]()
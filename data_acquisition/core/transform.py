@@ -1,35 +1,260 @@
 # core/write_core_records.py
+import time
 from datetime import date
 from pathlib import Path
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
 
+from config import HISTORY_MODEL
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 DB_FILE = Path("data/core/events.duckdb")
 
+# History table of the "scd2" history model (see `write_core_batch`)
+HISTORY_TABLE = "events_history"
+
+# Table holding only the most recent snapshot of every event; served by the API
+LATEST_TABLE = "events_latest"
+
+# Per-day event counts by venue and event type, used for the API's filter facets
+DAILY_COUNTS_TABLE = "events_daily_counts"
+
+# Timezone assumed for start times scraped without an explicit offset
+LOCAL_TIMEZONE = "Europe/Amsterdam"
+
+# SCD2 history: rows are identified by the key and re-inserted when a tracked column changes
+SCD2_KEY = ["venue", "event_name", "start_date_time"]
+SCD2_TRACKED = ["event_type", "ticket_url", "price"]
+
+# Time of day followed by a UTC offset, e.g. "20:00:00+01:00" or "19:00Z"
+_UTC_OFFSET_PATTERN = r"\d:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}(?::?\d{2})?)$"
+
 
 def write_core_records(
-    df: pd.DataFrame, as_of_date: str | None = None, table_name: str = "events"
+    df: pd.DataFrame, as_of_date: str | None = None, table_name: str | None = None
 ) -> None:
     """
     Write a DataFrame to DuckDB, adding as_of_date.
     Overwrites existing rows for the same venue + as_of_date.
     Assumes df already has a 'venue' column.
-    
+
+    Single-frame wrapper around `write_core_batch`.
+
     Args:
         df: DataFrame with event records
         as_of_date: ISO format date string (defaults to today)
-        table_name: DuckDB table name
+        table_name: DuckDB table name (defaults to the history model's table)
+    """
+    write_core_batch([df], as_of_date=as_of_date, table_name=table_name)
+
+
+def write_core_batch(
+    frames: list[pd.DataFrame],
+    as_of_date: str | None = None,
+    table_name: str | None = None,
+    history_model: str | None = None,
+    db_file: Path | None = None,
+) -> None:
     """
+    Write the frames of several venues in one transaction over one connection.
+
+    With the "snapshot" history model, every write stores a full copy of the
+    venues' events under as_of_date, replacing rows for the same venue +
+    as_of_date. With "scd2", rows carry valid_from/valid_to and are only added
+    when an event appears or a tracked column changes (see `_write_scd2`).
+
+    The derived tables are refreshed in the same transaction, so a failed write
+    leaves the database exactly as it was.
+
+    Args:
+        frames: DataFrames with event records, e.g. one per venue
+        as_of_date: ISO format date string (defaults to today)
+        table_name: DuckDB table name (defaults to "events", or HISTORY_TABLE for scd2)
+        history_model: "snapshot" or "scd2" (defaults to config.HISTORY_MODEL)
+        db_file: DuckDB file to write to (defaults to DB_FILE)
+    """
+    history_model = history_model or HISTORY_MODEL
+    db_file = db_file or DB_FILE
+    if history_model not in ("snapshot", "scd2"):
+        raise ValueError(f"Unknown history model: {history_model}")
+    if table_name is None:
+        table_name = HISTORY_TABLE if history_model == "scd2" else "events"
     if as_of_date is None:
         as_of_date = date.today().isoformat()
 
+    frames = [f for f in frames if len(f) > 0]
+    if not frames:
+        logger.info("No records to write")
+        return
+    df = _prepare_core_frame(pd.concat(frames, ignore_index=True), as_of_date)
+    venues = df["venue"].dropna().unique().tolist()
+
+    # Ensure DB folder exists
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    con = duckdb.connect(database=str(db_file))
+    try:
+        con.register("core_batch", _as_arrow(df))
+        con.begin()
+        if history_model == "scd2":
+            _write_scd2(con, table_name, as_of_date, venues)
+            refresh_latest_events(
+                con, venues, table_name=table_name, order_column="valid_from", current_only=True
+            )
+        else:
+            _write_snapshot(con, table_name, as_of_date, venues, df.columns)
+            refresh_latest_events(con, venues, table_name=table_name)
+        refresh_daily_counts(con)
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+
+    logger.info(
+        f"Written {len(df)} rows for venues={venues}, as_of_date={as_of_date} "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+
+
+def _write_snapshot(
+    con: duckdb.DuckDBPyConnection,
+    table_name: str,
+    as_of_date: str,
+    venues: list[str],
+    batch_cols: list[str],
+) -> None:
+    """Store the batch as the venues' full snapshot for as_of_date."""
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM core_batch LIMIT 0"
+    )
+    migrate_start_date_time(con, table_name)
+
+    # Ensure schema has 'event_type'; add column if missing
+    table_cols = [r[0] for r in con.execute(
+        f"SELECT name FROM pragma_table_info('{table_name}')"
+    ).fetchall()]
+    if 'event_type' not in table_cols:
+        con.execute(f"ALTER TABLE {table_name} ADD COLUMN event_type VARCHAR")
+        table_cols.append('event_type')
+
+    # Replace this batch's venues for the day
+    con.execute(
+        f"DELETE FROM {table_name} WHERE as_of_date = ? AND list_contains(?, venue)",
+        [as_of_date, venues],
+    )
+
+    # Insert by explicit column list; table columns missing from the batch stay NULL
+    insert_cols = ", ".join(c for c in table_cols if c in batch_cols)
+    con.execute(
+        f"INSERT INTO {table_name} ({insert_cols}) SELECT {insert_cols} FROM core_batch"
+    )
+
+
+def _write_scd2(
+    con: duckdb.DuckDBPyConnection, table_name: str, as_of_date: str, venues: list[str]
+) -> None:
+    """
+    Apply the batch to an SCD2 history table for the venues' as_of_date scrape.
+
+    Current rows (valid_to IS NULL) that are missing from the scrape, or whose
+    tracked columns changed, get valid_to = as_of_date; events that are new or
+    changed are inserted with valid_from = as_of_date. Writing the same day
+    again first undoes that day's changes, so re-runs are idempotent.
+    """
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            venue VARCHAR,
+            event_type VARCHAR,
+            event_name VARCHAR,
+            start_date_time TIMESTAMPTZ,
+            ticket_url VARCHAR,
+            price DOUBLE,
+            valid_from DATE NOT NULL,
+            valid_to DATE
+        )
+    """)
+    latest = con.execute(
+        f"SELECT MAX(GREATEST(valid_from, COALESCE(valid_to, valid_from))) FROM {table_name} "
+        "WHERE list_contains(?, venue)",
+        [venues],
+    ).fetchone()[0]
+    if latest is not None and latest > date.fromisoformat(as_of_date):
+        raise ValueError(
+            f"Cannot write as_of_date={as_of_date} before the history's last change ({latest})"
+        )
+
+    # A re-run for the same day replaces that day's changes
+    con.execute(
+        f"DELETE FROM {table_name} WHERE valid_from = ? AND list_contains(?, venue)",
+        [as_of_date, venues],
+    )
+    con.execute(
+        f"UPDATE {table_name} SET valid_to = NULL WHERE valid_to = ? AND list_contains(?, venue)",
+        [as_of_date, venues],
+    )
+
+    cols = ", ".join(SCD2_KEY + SCD2_TRACKED)
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE scd2_incoming AS
+        SELECT venue, event_type, event_name, start_date_time, ticket_url,
+               TRY_CAST(price AS DOUBLE) AS price
+        FROM core_batch
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY {", ".join(SCD2_KEY)}) = 1
+    """)
+    same_key = _not_distinct(SCD2_KEY, "i", "h")
+    same_values = _not_distinct(SCD2_TRACKED, "i", "h")
+    con.execute(
+        f"""
+        UPDATE {table_name} AS h SET valid_to = ?
+        WHERE valid_to IS NULL AND list_contains(?, venue)
+          AND NOT EXISTS (
+              SELECT 1 FROM scd2_incoming AS i WHERE {same_key} AND {same_values}
+          )
+        """,
+        [as_of_date, venues],
+    )
+    con.execute(
+        f"""
+        INSERT INTO {table_name} ({cols}, valid_from, valid_to)
+        SELECT {cols}, CAST(? AS DATE), NULL FROM scd2_incoming AS i
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name} AS h WHERE h.valid_to IS NULL AND {same_key}
+        )
+        """,
+        [as_of_date],
+    )
+    con.execute("DROP TABLE scd2_incoming")
+
+
+def _not_distinct(columns: list[str], left: str, right: str) -> str:
+    """SQL condition that two row aliases agree on `columns`, treating NULLs as equal."""
+    return " AND ".join(
+        f"{left}.{c} IS NOT DISTINCT FROM {right}.{c}" for c in columns
+    )
+
+
+def _prepare_core_frame(df: pd.DataFrame, as_of_date: str) -> pd.DataFrame:
+    """Add as_of_date, normalize start times and put the core columns first.
+
+    Rows whose start time cannot be resolved (unparseable, or a DST-ambiguous
+    local time) are dropped and logged, so start_date_time is never NULL.
+    """
     df = df.copy()
     df["as_of_date"] = as_of_date
+    if "start_date_time" in df.columns:
+        df["start_date_time"] = normalize_start_date_time(df["start_date_time"])
+        missing = df["start_date_time"].isna()
+        if missing.any():
+            counts = df.loc[missing, "venue"].value_counts(dropna=False).to_dict()
+            logger.warning(f"Dropped {missing.sum()} rows without a valid start time: {counts}")
+            df = df[~missing].reset_index(drop=True)
 
     # Ensure required columns exist and enforce desired column order
     desired_cols = [
@@ -41,46 +266,174 @@ def write_core_records(
 
     # Move desired columns to front in the requested order, keep extras after
     other_cols = [c for c in df.columns if c not in desired_cols]
-    df = df[desired_cols + other_cols]
+    return df[desired_cols + other_cols]
 
-    # Ensure DB folder exists
-    DB_FILE.parent.mkdir(parents=True, exist_ok=True)
 
-    con = duckdb.connect(database=str(DB_FILE))
+def _as_arrow(df: pd.DataFrame) -> pa.Table | pd.DataFrame:
+    """Convert to an Arrow table for zero-copy registration.
 
-    # Create table if it doesn't exist
+    Falls back to the pandas frame when a column has mixed types Arrow
+    cannot represent.
+    """
     try:
-        con.execute(f"SELECT 1 FROM {table_name} LIMIT 1")
-    except duckdb.CatalogException:
-        con.execute(f"CREATE TABLE {table_name} AS SELECT * FROM df LIMIT 0")
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df
 
-    # Ensure schema has 'event_type'; add column if missing
+
+def refresh_latest_events(
+    con: duckdb.DuckDBPyConnection,
+    venues: list[str] | None = None,
+    table_name: str = "events",
+    latest_table: str = LATEST_TABLE,
+    order_column: str = "as_of_date",
+    current_only: bool = False,
+) -> None:
+    """
+    Refresh the materialized latest-events table from the history table.
+
+    Keeps one row per (venue, event_name, start_date_time): the one with the
+    most recent `order_column` (as_of_date, or valid_from for SCD2 history).
+    With `current_only`, versions closed by a later scrape (valid_to set) are
+    left out, so events that disappeared are no longer served.
+    Only the given venues are recomputed; the whole table is rebuilt when it
+    does not exist yet or no venues are given.
+
+    Args:
+        con: Open read-write DuckDB connection
+        venues: Venues whose latest rows should be recomputed
+        table_name: History table to read from
+        latest_table: Materialized table to refresh
+        order_column: Column ordering the versions of an event
+        current_only: Keep only rows with valid_to IS NULL (SCD2 history)
+    """
+    current = "valid_to IS NULL" if current_only else "TRUE"
+    latest_query = f"""
+        SELECT * FROM {table_name}
+        WHERE {current} AND {{venue_filter}}
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY venue, event_name, start_date_time
+            ORDER BY {order_column} DESC
+        ) = 1
+        ORDER BY start_date_time
+    """
     try:
-        table_cols = [r[0] for r in con.execute(
-            f"SELECT name FROM pragma_table_info('{table_name}')"
-        ).fetchall()]
-    except Exception:
-        table_cols = []
-    if 'event_type' not in table_cols:
-        con.execute(f"ALTER TABLE {table_name} ADD COLUMN event_type VARCHAR")
-        # refresh table_cols after schema change
-        table_cols = [r[0] for r in con.execute(
-            f"SELECT name FROM pragma_table_info('{table_name}')"
-        ).fetchall()]
-
-    # Delete existing rows for each venue in this batch
-    for v in df["venue"].unique():
-        con.execute(f"""
-            DELETE FROM {table_name} 
-            WHERE venue = '{v}' AND as_of_date = '{as_of_date}'
-        """)
-
-    # Insert new rows using explicit column list to avoid order mismatches
-    insert_cols = ", ".join(table_cols)
-    con.execute(f"INSERT INTO {table_name} ({insert_cols}) SELECT {insert_cols} FROM df")
-    con.close()
+        con.execute(f"SELECT 1 FROM {latest_table} LIMIT 1")
+        exists = True
+    except duckdb.CatalogException:
+        exists = False
 
-    logger.info(
-        f"Written {len(df)} rows for venues={df['venue'].unique().tolist()}, "
-        f"as_of_date={as_of_date}"
+    if not exists or not venues:
+        con.execute(
+            f"CREATE OR REPLACE TABLE {latest_table} AS {latest_query.format(venue_filter='TRUE')}"
+        )
+        return
+
+    con.execute(f"DELETE FROM {latest_table} WHERE list_contains(?, venue)", [venues])
+    con.execute(
+        f"INSERT INTO {latest_table} BY NAME "
+        f"{latest_query.format(venue_filter='list_contains(?, venue)')}",
+        [venues],
+    )
+    # The inserted venues' rows land at the end of the table: rewrite it in start time
+    # order so each row group covers a narrow range and date filters can skip the rest.
+    # Only the small latest table is rewritten; the history is not read again.
+    con.execute(
+        f"CREATE OR REPLACE TABLE {latest_table} AS "
+        f"SELECT * FROM {latest_table} ORDER BY start_date_time"
+    )
+
+
+def refresh_daily_counts(
+    con: duckdb.DuckDBPyConnection,
+    latest_table: str = LATEST_TABLE,
+    counts_table: str = DAILY_COUNTS_TABLE,
+) -> None:
+    """
+    Rebuild the per-day event counts from the latest-events table.
+
+    Days are Amsterdam calendar days. The table is small (days x venues x
+    event types), so the API can answer facet requests without scanning events.
+    """
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {counts_table} AS
+        SELECT
+            CAST(timezone('{LOCAL_TIMEZONE}', start_date_time) AS DATE) AS day,
+            venue,
+            event_type,
+            COUNT(*) AS events
+        FROM {latest_table}
+        WHERE start_date_time IS NOT NULL
+        GROUP BY ALL
+        ORDER BY day, venue, event_type
+    """)
+
+
+def normalize_start_date_time(values: pd.Series) -> pd.Series:
+    """
+    Parse start times into timezone-aware UTC timestamps.
+
+    Scrapers hand over a mix of tz-aware timestamps and strings with or without
+    an offset; values without an offset are taken as Amsterdam local time.
+    Unparseable values become NaT. Values with and without an offset are each
+    parsed in one vectorized call.
+    """
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        return values.dt.tz_convert("UTC")
+    if pd.api.types.is_datetime64_dtype(values):
+        return _localize(values)
+
+    is_text = values.map(lambda v: isinstance(v, str)).astype(bool)
+    has_offset = values.map(lambda v: getattr(v, "tzinfo", None) is not None).astype(bool)
+    has_offset |= is_text & values.where(is_text, "").str.strip().str.contains(
+        _UTC_OFFSET_PATTERN, regex=True
+    )
+
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+    if has_offset.any():
+        result[has_offset] = pd.to_datetime(
+            values[has_offset], utc=True, errors="coerce", format="mixed"
+        )
+    naive = ~has_offset & values.notna()
+    if naive.any():
+        result[naive] = _localize(
+            pd.to_datetime(values[naive], errors="coerce", format="mixed")
+        )
+    return result
+
+
+def _localize(values: pd.Series) -> pd.Series:
+    """Take naive timestamps as Amsterdam local time and convert them to UTC."""
+    return values.dt.tz_localize(
+        LOCAL_TIMEZONE, ambiguous="NaT", nonexistent="shift_forward"
+    ).dt.tz_convert("UTC")
+
+
+def migrate_start_date_time(con: duckdb.DuckDBPyConnection, table_name: str = "events") -> bool:
+    """
+    Convert a VARCHAR or TIMESTAMP start_date_time column to TIMESTAMPTZ in place.
+
+    Strings carrying an offset keep it; naive values are taken as Amsterdam local
+    time. Returns True if the column was converted.
+    """
+    row = con.execute(
+        f"SELECT type FROM pragma_table_info('{table_name}') WHERE name = 'start_date_time'"
+    ).fetchone()
+    if row is None or row[0] == "TIMESTAMP WITH TIME ZONE":
+        return False
+
+    if row[0] == "VARCHAR":
+        using = f"""
+            CASE WHEN regexp_matches(start_date_time, '{_UTC_OFFSET_PATTERN}')
+                THEN TRY_CAST(start_date_time AS TIMESTAMPTZ)
+                ELSE timezone('{LOCAL_TIMEZONE}', TRY_CAST(start_date_time AS TIMESTAMP))
+            END
+        """
+    else:
+        using = f"timezone('{LOCAL_TIMEZONE}', CAST(start_date_time AS TIMESTAMP))"
+
+    con.execute(
+        f"ALTER TABLE {table_name} ALTER start_date_time SET DATA TYPE TIMESTAMPTZ USING {using}"
     )
+    logger.info(f"Migrated {table_name}.start_date_time from {row[0]} to TIMESTAMPTZ")
+    return True
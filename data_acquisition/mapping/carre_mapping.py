@@ -1,6 +1,8 @@
 import re
 from typing import Any
 
+from utils.column_mapping import column, constant, first_of, parse_price
+
 
 def map_carre(row: dict[str, Any]) -> dict[str, Any]:
     """Mapping function for Carré scraper rows."""
@@ -33,3 +35,14 @@ def map_carre(row: dict[str, Any]) -> dict[str, Any]:
     mapped['price'] = price_val
 
     return mapped
+
+
+# Column-level equivalent of the row function above, used by the pipeline
+COLUMN_MAPPING = {
+    'venue': constant('Carré'),
+    'event_type': constant('Theater'),
+    'event_name': first_of('title', 'name'),
+    'start_date_time': column('start_date_time'),
+    'ticket_url': first_of('ticket_url', default=''),
+    'price': parse_price('price'),
+}
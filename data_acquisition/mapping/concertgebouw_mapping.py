@@ -1,5 +1,7 @@
 from typing import Any
 
+from utils.column_mapping import column, constant, first_of, to_float
+
 
 def map_concertgebouw(row: dict[str, Any]) -> dict[str, Any]:
     """Mapping function for Concertgebouw scraper rows."""
@@ -24,3 +26,14 @@ def map_concertgebouw(row: dict[str, Any]) -> dict[str, Any]:
         mapped['price'] = None
 
     return mapped
+
+
+# Column-level equivalent of the row function above, used by the pipeline
+COLUMN_MAPPING = {
+    'venue': constant('Concertgebouw'),
+    'event_type': constant('Concert'),
+    'event_name': first_of('title', 'name'),
+    'start_date_time': column('start_date_time'),
+    'ticket_url': column('ticket_url'),
+    'price': to_float('price'),
+}
@@ -1,5 +1,7 @@
 from typing import Any
 
+from utils.column_mapping import column, constant, first_of, nonempty
+
 
 def map_de_balie(row: dict[str, Any]) -> dict[str, Any]:
     """Mapping function for De Balie scraper rows."""
@@ -15,3 +17,14 @@ def map_de_balie(row: dict[str, Any]) -> dict[str, Any]:
     mapped['price'] = row.get('price') if row.get('price') else None
 
     return mapped
+
+
+# Column-level equivalent of the row function above, used by the pipeline
+COLUMN_MAPPING = {
+    'venue': constant('De Balie'),
+    'event_type': constant('Actualiteit'),
+    'event_name': first_of('title', 'name'),
+    'start_date_time': column('start_date_time'),
+    'ticket_url': column('ticket_url'),
+    'price': nonempty('price'),
+}
@@ -1,5 +1,7 @@
 from typing import Any
 
+from utils.column_mapping import constant, first_of, nonempty, prefixed
+
 
 def map_melkweg(row: dict[str, Any]) -> dict[str, Any]:
     """
@@ -18,3 +20,14 @@ def map_melkweg(row: dict[str, Any]) -> dict[str, Any]:
     mapped['price'] = row.get('price') if row.get('price') else None
 
     return mapped
+
+
+# Column-level equivalent of the row function above, used by the pipeline
+COLUMN_MAPPING = {
+    'venue': constant('Melkweg'),
+    'event_type': constant('Concert'),
+    'event_name': first_of('title', 'name', 'summary'),
+    'start_date_time': first_of('startDateTime', 'startDate'),
+    'ticket_url': prefixed('http://www.melkweg.nl/', 'uri', 'url'),
+    'price': nonempty('price'),
+}
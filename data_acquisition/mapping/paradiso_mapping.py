@@ -1,5 +1,7 @@
 from typing import Any
 
+from utils.column_mapping import column, constant, first_of, nonempty, prefixed
+
 
 def map_paradiso(row: dict[str, Any]) -> dict[str, Any]:
     """
@@ -17,4 +19,15 @@ def map_paradiso(row: dict[str, Any]) -> dict[str, Any]:
     mapped['price'] = row.get('price') if row.get('price') else None
 
     # Keep any additional fields (if needed) appended after
-    return mapped
\ No newline at end of file
+    return mapped
+
+
+# Column-level equivalent of the row function above, used by the pipeline
+COLUMN_MAPPING = {
+    'venue': constant('Paradiso'),
+    'event_type': constant('Concert'),
+    'event_name': first_of('title', 'name', 'summary'),
+    'start_date_time': column('startDateTime'),
+    'ticket_url': prefixed('http://www.paradiso.nl/', 'uri'),
+    'price': nonempty('price'),
+}
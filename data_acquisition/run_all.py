@@ -1,14 +1,21 @@
+import argparse
 import importlib
 import os
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
 
-from core.transform import write_core_records
+from core.export import export_history, export_serving_db
+from core.transform import DB_FILE, write_core_batch
+from utils.column_mapping import map_records
+from utils.http_utils import disable_cache, enable_cache
 from utils.incremental import set_last_run, should_update
 from utils.logging_config import get_logger
-from utils.staging_utils import save_raw_csv
+from utils.staging_utils import STAGING_DIR, StagingSnapshot, list_snapshots, save_raw_snapshot
 from utils.validation import validate_records
 
 logger = get_logger(__name__)
@@ -79,65 +86,255 @@ def discover_scrapers(
 SCRAPERS = discover_scrapers()
 
 
-def run_all_scrapers(force_update: bool = False) -> None:
+def prepare_venue(
+    scraper_func: Callable, map_func: Callable, venue_name: str
+) -> pd.DataFrame:
+    """
+    Scrape, map and validate one venue (everything except the database write).
+
+    Safe to run concurrently for different venues.
+
+    Returns:
+        Validated core records (may be empty)
+    """
+    logger.info(f"Running scraper: {venue_name}")
+
+    # Step 1: get raw data
+    df_raw = scraper_func()
+    logger.info(f"Scraped {len(df_raw)} rows from {venue_name}")
+    save_raw_snapshot(df_raw, venue_name)
+
+    # Step 2: apply mapping
+    df_core = map_records(df_raw, map_func)
+    logger.info(f"Mapped rows to core schema for {venue_name}")
+
+    # Step 3: validate data
+    df_core = validate_records(df_core)
+    logger.debug(f"Sample data:\n{df_core.head()}")
+    return df_core
+
+
+def write_venues(ready: list[tuple[str, pd.DataFrame]]) -> list[str]:
+    """
+    Write the venues' records and return the names of the venues that were written.
+
+    All venues go into one transaction first. If that fails, each venue is
+    retried in a transaction of its own, so a bad value in one venue only
+    loses that venue.
+    """
+    if not ready:
+        return []
+    try:
+        write_core_batch([df_core for _, df_core in ready])
+        return [venue_name for venue_name, _ in ready]
+    except Exception as e:
+        if len(ready) == 1:
+            logger.error(f"Error writing {ready[0][0]}: {str(e)}", exc_info=True)
+            return []
+        logger.warning(f"Batch write failed ({e}); writing venues one by one")
+
+    written = []
+    for venue_name, df_core in ready:
+        try:
+            write_core_batch([df_core])
+            written.append(venue_name)
+        except Exception as e:
+            logger.error(f"Error writing {venue_name}: {str(e)}", exc_info=True)
+    return written
+
+
+def run_all_scrapers(force_update: bool = False, workers: int = 1) -> None:
     """
     Run all scrapers with error isolation, validation, and incremental updates.
     
     Args:
         force_update: If True, skip incremental update checks and always scrape
+        workers: Number of venues to scrape, map and validate concurrently.
+            All venues are written together, in one transaction at the end of the run.
     """
     logger.info("Starting data acquisition pipeline")
-    
-    successful_scrapers = 0
-    failed_scrapers = 0
+
     skipped_scrapers = 0
-    
+    due = []
     for scraper_func, map_func, venue_name in SCRAPERS:
+        # Check if update is needed
+        if not force_update and not should_update(venue_name):
+            logger.info(f"Skipping {venue_name} - recently updated")
+            skipped_scrapers += 1
+            continue
+        due.append((scraper_func, map_func, venue_name))
+
+    def collect(venue_name: str, get_records: Callable[[], pd.DataFrame]) -> pd.DataFrame | None:
+        """Collect one venue's validated records; errors stay isolated per venue."""
         try:
-            # Check if update is needed
-            if not force_update and not should_update(venue_name):
-                logger.info(f"Skipping {venue_name} - recently updated")
-                skipped_scrapers += 1
-                continue
-            
-            logger.info(f"Running scraper: {venue_name}")
-            
-            # Step 1: get raw data
-            df_raw = scraper_func()
-            logger.info(f"Scraped {len(df_raw)} rows from {venue_name}")
-            save_raw_csv(df_raw, venue_name)
-
-            # Step 2: apply mapping
-            df_core = df_raw.apply(map_func, axis=1)
-            df_core = pd.DataFrame(df_core.tolist())
-            logger.info(f"Mapped rows to core schema for {venue_name}")
-            
-            # Step 3: validate data
-            df_core = validate_records(df_core)
+            df_core = get_records()
             if len(df_core) == 0:
                 logger.error(f"No valid records after validation for {venue_name}")
-                failed_scrapers += 1
-                continue
-            
-            logger.debug(f"Sample data:\n{df_core.head()}")
-
-            # Step 4: write to core DB
-            write_core_records(df_core)
-            set_last_run(venue_name)
-            logger.info(f"Successfully processed {venue_name}")
-            successful_scrapers += 1
-            
+                return None
+            return df_core
         except Exception as e:
             logger.error(f"Error processing {venue_name}: {str(e)}", exc_info=True)
-            failed_scrapers += 1
-            continue
-    
+            return None
+
+    if workers <= 1:
+        results = []
+        for scraper_func, map_func, venue_name in due:
+            get_records = partial(prepare_venue, scraper_func, map_func, venue_name)
+            results.append((venue_name, collect(venue_name, get_records)))
+    else:
+        logger.info(f"Scraping {len(due)} venues with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            futures = {
+                executor.submit(prepare_venue, scraper_func, map_func, venue_name): venue_name
+                for scraper_func, map_func, venue_name in due
+            }
+            results = [(futures[f], collect(futures[f], f.result)) for f in as_completed(futures)]
+
+    # Step 4: write all venues to the core DB, in one transaction when possible
+    ready = [(venue_name, df_core) for venue_name, df_core in results if df_core is not None]
+    written = write_venues(ready)
+    for venue_name in written:
+        set_last_run(venue_name)
+        logger.info(f"Successfully processed {venue_name}")
+    successful_scrapers = len(written)
+    failed_scrapers = len(results) - successful_scrapers
+
     logger.info(
         f"Pipeline complete: {successful_scrapers} successful, {failed_scrapers} failed, "
         f"{skipped_scrapers} skipped"
     )
 
 
+def replay_snapshot(snapshot: StagingSnapshot, map_func: Callable) -> pd.DataFrame:
+    """Map and validate one stored raw snapshot. Runs in a worker process."""
+    return validate_records(map_records(snapshot.read(), map_func))
+
+
+def replay_snapshots(
+    since: datetime | None = None,
+    venue: str | None = None,
+    workers: int | None = None,
+    db_file: Path | None = None,
+    staging_dir: Path = STAGING_DIR,
+) -> None:
+    """
+    Re-run mapping and validation on stored raw snapshots and write the results.
+
+    The newest snapshot of each venue per day is replayed, in parallel across
+    processes, and written with that day as as_of_date, oldest day first.
+    Nothing is fetched and the scraper state is left untouched.
+
+    Args:
+        since: Only replay snapshots taken at or after this time
+        venue: Only replay this venue
+        workers: Worker processes (defaults to the number of CPUs; 1 runs inline)
+        db_file: DuckDB file to write to, e.g. a scratch copy (defaults to DB_FILE)
+        staging_dir: Root of the staging area
+    """
+    mappers = {venue_name: map_func for _, map_func, venue_name in SCRAPERS}
+    newest = {}
+    for snapshot in list_snapshots(venue, since, staging_dir):
+        if snapshot.venue not in mappers:
+            logger.warning(f"No mapping for staged venue {snapshot.venue}; skipping")
+            continue
+        newest[(snapshot.venue, snapshot.taken_at.date())] = snapshot
+    snapshots = sorted(newest.values(), key=lambda s: (s.taken_at.date(), s.venue))
+    if not snapshots:
+        logger.info("No staging snapshots to replay")
+        return
+
+    days = sorted({s.taken_at.date() for s in snapshots})
+    logger.info(f"Replaying {len(snapshots)} snapshots over {len(days)} days")
+    if workers == 1:
+        executor = None
+        results = [partial(replay_snapshot, s, mappers[s.venue]) for s in snapshots]
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [executor.submit(replay_snapshot, s, mappers[s.venue]) for s in snapshots]
+        results = [f.result for f in futures]
+
+    replayed = failed = 0
+    try:
+        # Snapshots are sorted by day; each day is written once its snapshots are mapped
+        pending = list(zip(snapshots, results))
+        for day in days:
+            frames = []
+            while pending and pending[0][0].taken_at.date() == day:
+                snapshot, result = pending.pop(0)
+                try:
+                    frames.append(result())
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Error replaying {snapshot.path}: {e}", exc_info=True)
+            try:
+                write_core_batch(frames, as_of_date=day.isoformat(), db_file=db_file)
+                replayed += len(frames)
+            except Exception as e:
+                failed += len(frames)
+                logger.error(f"Error writing replayed day {day}: {e}", exc_info=True)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    logger.info(f"Replay complete: {replayed} snapshots written, {failed} failed")
+
+
 # This ensures the function runs when the script is executed directly
 if __name__ == "__main__":
-    run_all_scrapers()
+    parser = argparse.ArgumentParser(description="Run all venue scrapers")
+    parser.add_argument(
+        "--force", action="store_true", help="Scrape every venue, even if recently updated"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Venues to scrape concurrently (default 1), or processes for --replay "
+        "(default: one per CPU)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Replay every venue from the HTTP cache without touching the network",
+    )
+    parser.add_argument(
+        "--no-http-cache", action="store_true", help="Always download pages in full"
+    )
+    parser.add_argument(
+        "--export",
+        action="store_true",
+        help="Afterwards, export the Parquet history and the serving database",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Re-map and validate stored raw snapshots from data/staging instead of scraping",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="With --replay, only snapshots taken on or after this date (YYYY-MM-DD)",
+    )
+    parser.add_argument("--venue", default=None, help="With --replay, only this venue")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help=f"With --replay, write to this DuckDB file instead of {DB_FILE}",
+    )
+    args = parser.parse_args()
+    if args.replay:
+        replay_snapshots(
+            since=args.since, venue=args.venue, workers=args.workers, db_file=args.db
+        )
+    else:
+        if args.offline or not args.no_http_cache:
+            enable_cache(offline=args.offline)
+        try:
+            run_all_scrapers(force_update=args.force or args.offline, workers=args.workers or 1)
+        finally:
+            disable_cache()
+    if args.export:
+        export_history(args.db or DB_FILE)
+        export_serving_db(args.db or DB_FILE)
@@ -1,12 +1,26 @@
+import asyncio
+import re
 from urllib.parse import unquote, urlparse
+from xml.etree import ElementTree
 
 import pandas as pd
+from bs4 import BeautifulSoup
 
+from config import carre as carre_config
+from utils.async_http_utils import async_safe_get, gather_bounded
+from utils.browser_pool import LINKS_SCRIPT, LazyBrowserPool
 from utils.http_utils import safe_get, safe_json
+from utils.incremental import fingerprint, plan_detail_fetches, save_detail_state
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+VENUE = 'Carré'
+HOMEPAGE = 'https://carre.nl'
+
+# Production slugs in links or embedded JSON, e.g. href="/voorstelling/some-show"
+_SLUG_PATTERN = re.compile(r'/voorstelling/([^"\'?#<>\s\\]+)')
+
 
 def _extract_slug(url: str) -> str:
     p = urlparse(url)
@@ -17,118 +31,192 @@ def _extract_slug(url: str) -> str:
     return ''
 
 
-def scrape() -> pd.DataFrame:
-    """Scrape Carré by using the site's JSON API per production when possible,
-    falling back to Playwright HTML rendering if needed.
+def _production_url(slug: str) -> str:
+    return f'{HOMEPAGE}/voorstelling/{slug}'
+
+
+def _sitemap_productions(url: str = carre_config.SITEMAP_URL) -> dict[str, str]:
+    """Production URL -> fingerprint of its <lastmod>, following a sitemap index one level."""
+    resp = safe_get(url, max_age=carre_config.HTTP_CACHE_MAX_AGE)
+    resp.raise_for_status()
+    root = ElementTree.fromstring(resp.content)
+    productions = {}
+    for entry in root:
+        fields = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in entry}
+        loc = fields.get('loc', '')
+        if entry.tag.endswith('sitemap') and url == carre_config.SITEMAP_URL:
+            productions.update(_sitemap_productions(loc))
+        elif slug := _extract_slug(loc):
+            productions[_production_url(slug)] = fingerprint(fields.get('lastmod', ''))
+    return productions
+
+
+def _homepage_productions() -> dict[str, str]:
+    """Production URLs linked or embedded (e.g. in JSON state) in the static homepage.
+
+    The homepage says nothing about changes, so these entries are only
+    refetched once their stored copy is older than DETAIL_REFRESH_HOURS.
     """
+    resp = safe_get(HOMEPAGE, max_age=carre_config.HTTP_CACHE_MAX_AGE)
+    resp.raise_for_status()
+    # JSON embedded in the page escapes slashes as \/
+    html = resp.text.replace('\\/', '/')
+    slugs = (unquote(slug).strip('/') for slug in _SLUG_PATTERN.findall(html))
+    return {_production_url(slug): fingerprint('') for slug in slugs if slug}
+
+
+async def _rendered_productions(browser: LazyBrowserPool) -> dict[str, str]:
+    """Production URLs linked from the homepage after rendering it in a browser."""
+    pool = await browser.get()
+    links = await pool.render(HOMEPAGE, evaluate=LINKS_SCRIPT) or []
+    productions = {}
+    for href, text in links:
+        if (slug := _extract_slug(href or '')) and _production_url(slug) not in productions:
+            productions[_production_url(slug)] = fingerprint(' '.join((text or '').split()))
+    return productions
+
+
+async def _discover_productions(browser: LazyBrowserPool) -> dict[str, str]:
+    """All production URLs with listing fingerprints, from the first source that has any.
+
+    The sitemap and the static homepage need no browser; rendering the
+    homepage in `browser` is the last resort.
+    """
+    for source in (_sitemap_productions, _homepage_productions, _rendered_productions):
+        try:
+            if source is _rendered_productions:
+                productions = await source(browser)
+            else:
+                productions = source()
+        except Exception as e:
+            logger.warning('Carré discovery via %s failed: %s', source.__name__, e)
+            continue
+        if productions:
+            logger.info('Found %d Carré productions via %s', len(productions), source.__name__)
+            return productions
+    logger.error('Found no Carré productions')
+    return {}
+
+
+def _parse_productions(data: dict, slug: str) -> list[dict]:
+    """Flatten a render-API payload into one record per performance."""
     events = []
+    productions = data.get('productions') or {}
+    for prod_key, prod in productions.items():
+        # try to get a production title from prod.data
+        prod_data = prod.get('data') or {}
+        prod_title = (
+            prod_data.get('title')
+            or prod_data.get('name')
+            or prod.get('id')
+            or slug
+        )
+        events_list = prod.get('events') or []
+        for ev in events_list:
+            start = ev.get('start_date') or ev.get('start') or ev.get('start_date_time')
+            ticket = (
+                ev.get('sales_url')
+                or ev.get('ticketUrl')
+                or ev.get('salesUrl')
+                or ev.get('sales_url')
+            )
+            events.append({
+                'venue': VENUE,
+                'start_date_time': start,
+                'ticket_url': ticket,
+                'price': '',
+                'title': prod_title,
+            })
+    return events
+
 
-    # Try Playwright to collect production URLs (if available).
+def _parse_production_page(url: str, content: str) -> dict:
+    """One record from a rendered production page (first <time> and <h1>)."""
+    s = BeautifulSoup(content, 'html.parser')
+    time_tag = s.find('time')
+    title_tag = s.find('h1')
+    start = None
+    if time_tag and time_tag.has_attr('datetime'):
+        start = time_tag['datetime']
+    return {
+        'venue': VENUE,
+        'start_date_time': start,
+        'ticket_url': url,
+        'price': '',
+        'title': title_tag.text.strip() if title_tag else url,
+    }
+
+
+async def _fetch_production(full: str) -> list[dict] | None:
+    """Fetch one production's performances; None if the fetch failed."""
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto('https://carre.nl', wait_until='networkidle')
-            hrefs = page.eval_on_selector_all('a', 'els => els.map(e => e.href)')
-            browser.close()
-    except Exception:
-        logger.info(
-            'Playwright not available when collecting Carré links; using static homepage fetch'
+        slug = _extract_slug(full)
+        if not slug:
+            return []
+        api = f'https://carre.nl/api/render/voorstelling/{slug}'
+        resp = await async_safe_get(api, max_age=carre_config.HTTP_CACHE_MAX_AGE)
+        if resp.status_code != 200:
+            logger.debug('Carré API %s returned %s', api, resp.status_code)
+            return None
+        return _parse_productions(safe_json(resp), slug)
+    except Exception as e:
+        logger.warning('Error fetching Carré production %s: %s', full, e)
+        return None
+
+
+async def _fetch_productions(urls: list[str]) -> list[list[dict] | None]:
+    """Fetch production pages concurrently, in the order of `urls`."""
+    return await gather_bounded(_fetch_production(url) for url in urls)
+
+
+async def _scrape() -> list[dict]:
+    """Records of every production; at most one browser is started for the whole run."""
+    events = []
+    async with LazyBrowserPool() as browser:
+        productions = await _discover_productions(browser)
+
+        # Only new or changed productions are fetched from the API, which returns structured events
+        to_fetch, carried = plan_detail_fetches(
+            VENUE, productions, max_age_hours=carre_config.DETAIL_REFRESH_HOURS
         )
-        try:
-            resp = safe_get('https://carre.nl')
-            from bs4 import BeautifulSoup
-            s = BeautifulSoup(resp.content, 'html.parser')
-            hrefs = [a.get('href') for a in s.find_all('a', href=True)]
-        except Exception as e:
-            logger.error('Failed to fetch Carré homepage: %s', e)
-            hrefs = []
-
-    # Filter for production pages and limit volume
-    ev_urls = [h for h in hrefs if h and '/voorstelling/' in h]
-    # Normalize and dedupe
-    seen = set()
-    ev_urls_unique = []
-    for h in ev_urls:
-        if h not in seen:
-            seen.add(h)
-            ev_urls_unique.append(h)
-        if len(ev_urls_unique) >= 100:
-            break
-
-    # For each production, try the API endpoint which returns structured events
-    for full in ev_urls_unique:
-        try:
-            slug = _extract_slug(full)
-            if not slug:
-                continue
-            api = f'https://carre.nl/api/render/voorstelling/{slug}'
-            resp = safe_get(api)
-            if resp.status_code != 200:
-                logger.debug('Carré API %s returned %s', api, resp.status_code)
-                continue
-            data = safe_json(resp)
-            productions = data.get('productions') or {}
-            for prod_key, prod in productions.items():
-                # try to get a production title from prod.data
-                prod_data = prod.get('data') or {}
-                prod_title = (
-                    prod_data.get('title')
-                    or prod_data.get('name')
-                    or prod.get('id')
-                    or slug
-                )
-                events_list = prod.get('events') or []
-                for ev in events_list:
-                    start = ev.get('start_date') or ev.get('start') or ev.get('start_date_time')
-                    ticket = (
-                        ev.get('sales_url')
-                        or ev.get('ticketUrl')
-                        or ev.get('salesUrl')
-                        or ev.get('sales_url')
-                    )
-                    events.append({
-                        'venue': 'Carré',
-                        'start_date_time': start,
-                        'ticket_url': ticket,
-                        'price': '',
-                        'title': prod_title,
-                    })
-        except Exception as e:
-            logger.warning('Error fetching Carré production %s: %s', full, e)
+        results = await _fetch_productions(to_fetch)
+        fetched = {
+            url: evs for url, evs in zip(to_fetch, results, strict=True) if evs is not None
+        }
+        save_detail_state(VENUE, productions, fetched)
+        for url in productions:
+            events.extend(fetched.get(url) or carried.get(url) or [])
 
-    # If API yielded nothing, try a Playwright HTML parse per-production (older fallback)
-    if not events:
-        try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as pw:
-                browser = pw.chromium.launch(headless=True)
-                page = browser.new_page()
-                for url in ev_urls_unique[:50]:
-                    try:
-                        page.goto(url, wait_until='networkidle')
-                        content = page.content()
-                        from bs4 import BeautifulSoup
-                        s = BeautifulSoup(content, 'html.parser')
-                        time_tag = s.find('time')
-                        title_tag = s.find('h1')
-                        start = None
-                        if time_tag and time_tag.has_attr('datetime'):
-                            start = time_tag['datetime']
-                        title_text = title_tag.text.strip() if title_tag else url
-                        events.append({
-                            'venue': 'Carré',
-                            'start_date_time': start,
-                            'ticket_url': url,
-                            'price': '',
-                            'title': title_text,
-                        })
-                    except Exception as e:
-                        logger.warning('Failed to parse Carré event %s: %s', url, e)
-                browser.close()
-        except Exception as e:
-            logger.error('Playwright fallback failed for Carré: %s', e)
+        # Productions whose API fetch failed are rendered in browser tabs instead (older
+        # fallback), up to MAX_RENDERED_PAGES of them
+        failed = [url for url in to_fetch if url not in fetched]
+        if len(failed) > carre_config.MAX_RENDERED_PAGES:
+            logger.warning(
+                'Rendering %d of %d Carré productions whose API fetch failed',
+                carre_config.MAX_RENDERED_PAGES, len(failed),
+            )
+            failed = failed[:carre_config.MAX_RENDERED_PAGES]
+        if failed:
+            try:
+                pool = await browser.get()
+                pages = await pool.render_all(failed)
+                for url, content in zip(failed, pages, strict=True):
+                    if content is not None:
+                        events.append(_parse_production_page(url, content))
+            except Exception as e:
+                logger.error('Playwright fallback failed for Carré: %s', e)
+    return events
+
+
+def scrape() -> pd.DataFrame:
+    """Scrape Carré by using the site's JSON API per production when possible,
+    falling back to rendering the pages in a shared headless browser if needed.
+
+    Productions are discovered without a browser (sitemap, then the static
+    homepage) and every one is fetched; there is no cap on their number. Only
+    productions whose API fetch failed are rendered, at most MAX_RENDERED_PAGES.
+    """
+    events = asyncio.run(_scrape())
 
     df = pd.DataFrame(events)
     if not df.empty:
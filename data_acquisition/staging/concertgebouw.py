@@ -1,11 +1,18 @@
+import asyncio
+
 import pandas as pd
 from bs4 import BeautifulSoup
 
+from config import concertgebouw as concertgebouw_config
+from utils.async_http_utils import async_safe_get, gather_bounded
 from utils.http_utils import safe_get
+from utils.incremental import fingerprint, plan_detail_fetches, save_detail_state
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+VENUE = 'Concertgebouw'
+
 
 def scrape(max_events: int = 50) -> pd.DataFrame:
     """Scrape Concertgebouw events by harvesting event links and parsing pages."""
@@ -17,96 +24,25 @@ def scrape(max_events: int = 50) -> pd.DataFrame:
         logger.error('Failed to parse Concertgebouw listing: %s', e)
         return pd.DataFrame(columns=['venue', 'start_date_time', 'ticket_url', 'price'])
 
-    links = [a['href'] for a in soup.find_all('a', href=True)]
-    ev_links = [h for h in links if h.startswith('/en/concerts/')]
-    # dedupe
-    seen = set()
-    unique = []
-    for h in ev_links:
-        if h not in seen:
-            seen.add(h)
-            unique.append(h)
-        if len(unique) >= max_events:
+    # dedupe, keeping a fingerprint of each event's listing card
+    fingerprints = {}
+    for a in soup.find_all('a', href=True):
+        h = a['href']
+        if not h.startswith('/en/concerts/') or h in fingerprints:
+            continue
+        fingerprints[h] = _listing_fingerprint(a)
+        if len(fingerprints) >= max_events:
             break
 
+    # Only new or changed event pages are fetched, concurrently (bounded per host)
+    to_fetch, carried = plan_detail_fetches(
+        VENUE, fingerprints, max_age_hours=concertgebouw_config.DETAIL_REFRESH_HOURS
+    )
+    fetched = asyncio.run(_fetch_events([(base + rel, rel) for rel in to_fetch]))
+    save_detail_state(VENUE, fingerprints, fetched)
     events = []
-    for rel in unique:
-        url = base + rel
-        try:
-            resp = safe_get(url)
-            page = BeautifulSoup(resp.content, 'html.parser')
-            # try JSON-LD first
-            jl = page.find('script', type='application/ld+json')
-            start_dt = None
-            ticket_url = None
-            if jl and (jl.string or jl.text):
-                try:
-                    import json
-                    data = json.loads(jl.string or jl.text)
-                    # data may be dict with startDate or offers
-                    if isinstance(data, dict):
-                        start_dt = data.get('startDate') or data.get('start_date')
-                        offers = data.get('offers')
-                        if isinstance(offers, dict):
-                            ticket_url = offers.get('url')
-                except Exception:
-                    pass
-
-            # fallback to HTML parsing
-            if not start_dt:
-                time_tag = page.find('time')
-                if time_tag:
-                    start_dt = time_tag.get('datetime') or time_tag.text.strip()
-            title_tag = page.find('h1')
-            title = title_tag.text.strip() if title_tag else rel
-            # fallback ticket link
-            if not ticket_url:
-                a_ticket = page.find(
-                    'a',
-                    href=lambda x: x
-                    and ('tix.concertgebouw.nl' in x or 'tickets' in x or 'buy' in x),
-                )
-                if a_ticket:
-                    ticket_url = a_ticket.get('href')
-
-            # Ensure required fields are present (validation requires non-null values)
-            if not ticket_url:
-                ticket_url = url
-
-            # try to extract a price from JSON-LD offers if available
-            price_val = ''
-            if jl and (jl.string or jl.text):
-                try:
-                    import json
-                    data = json.loads(jl.string or jl.text)
-                    offers = None
-                    if isinstance(data, dict):
-                        offers = data.get('offers')
-                    # offers might be a dict or a list
-                    if isinstance(offers, dict):
-                        price_val = (
-                            offers.get('price')
-                            or offers.get('priceSpecification', {}).get('price')
-                            or ''
-                        )
-                    elif isinstance(offers, list) and offers:
-                        price_val = (
-                            offers[0].get('price')
-                            or offers[0].get('priceSpecification', {}).get('price')
-                            or ''
-                        )
-                except Exception:
-                    price_val = ''
-
-            events.append({
-                'venue': 'Concertgebouw',
-                'start_date_time': start_dt,
-                'ticket_url': ticket_url,
-                'price': price_val,
-                'title': title,
-            })
-        except Exception as e:
-            logger.warning('Failed to fetch Concertgebouw event %s: %s', rel, e)
+    for rel in fingerprints:
+        events.extend(fetched.get(rel) or carried.get(rel) or [])
 
     df = pd.DataFrame(events)
     # normalize start_date_time
@@ -118,3 +54,109 @@ def scrape(max_events: int = 50) -> pd.DataFrame:
         df = df.dropna(subset=['start_date_time'])
     return df
 
+
+def _listing_fingerprint(a) -> str:
+    """Fingerprint the listing card around an event link (title, date, status)."""
+    card = a.find_parent(['article', 'li']) or a
+    return fingerprint(card.get_text(' ', strip=True))
+
+
+async def _fetch_events(pages: list[tuple[str, str]]) -> dict[str, list[dict]]:
+    """Fetch and parse event pages concurrently; failed pages are left out."""
+    results = await gather_bounded(_fetch_event(url, rel) for url, rel in pages)
+    return {rel: [ev] for (_, rel), ev in zip(pages, results, strict=True) if ev}
+
+
+async def _fetch_event(url: str, rel: str) -> dict | None:
+    """Fetch one event page; None if the fetch failed or the page has no start time.
+
+    A None result is not stored, so the page is fetched again next run.
+    """
+    try:
+        resp = await async_safe_get(url, max_age=concertgebouw_config.HTTP_CACHE_MAX_AGE)
+        if resp.status_code != 200:
+            logger.warning('Concertgebouw event %s returned %s', rel, resp.status_code)
+            return None
+        ev = _parse_event_page(resp.content, url, rel)
+    except Exception as e:
+        logger.warning('Failed to fetch Concertgebouw event %s: %s', rel, e)
+        return None
+    if not ev['start_date_time']:
+        logger.warning('No start time on Concertgebouw event page %s', rel)
+        return None
+    return ev
+
+
+def _parse_event_page(content: bytes, url: str, rel: str) -> dict:
+    """Extract start time, ticket link, price and title from an event page."""
+    page = BeautifulSoup(content, 'html.parser')
+    # try JSON-LD first
+    jl = page.find('script', type='application/ld+json')
+    start_dt = None
+    ticket_url = None
+    if jl and (jl.string or jl.text):
+        try:
+            import json
+            data = json.loads(jl.string or jl.text)
+            # data may be dict with startDate or offers
+            if isinstance(data, dict):
+                start_dt = data.get('startDate') or data.get('start_date')
+                offers = data.get('offers')
+                if isinstance(offers, dict):
+                    ticket_url = offers.get('url')
+        except Exception:
+            pass
+
+    # fallback to HTML parsing
+    if not start_dt:
+        time_tag = page.find('time')
+        if time_tag:
+            start_dt = time_tag.get('datetime') or time_tag.text.strip()
+    title_tag = page.find('h1')
+    title = title_tag.text.strip() if title_tag else rel
+    # fallback ticket link
+    if not ticket_url:
+        a_ticket = page.find(
+            'a',
+            href=lambda x: x
+            and ('tix.concertgebouw.nl' in x or 'tickets' in x or 'buy' in x),
+        )
+        if a_ticket:
+            ticket_url = a_ticket.get('href')
+
+    # Ensure required fields are present (validation requires non-null values)
+    if not ticket_url:
+        ticket_url = url
+
+    # try to extract a price from JSON-LD offers if available
+    price_val = ''
+    if jl and (jl.string or jl.text):
+        try:
+            import json
+            data = json.loads(jl.string or jl.text)
+            offers = None
+            if isinstance(data, dict):
+                offers = data.get('offers')
+            # offers might be a dict or a list
+            if isinstance(offers, dict):
+                price_val = (
+                    offers.get('price')
+                    or offers.get('priceSpecification', {}).get('price')
+                    or ''
+                )
+            elif isinstance(offers, list) and offers:
+                price_val = (
+                    offers[0].get('price')
+                    or offers[0].get('priceSpecification', {}).get('price')
+                    or ''
+                )
+        except Exception:
+            price_val = ''
+
+    return {
+        'venue': VENUE,
+        'start_date_time': start_dt,
+        'ticket_url': ticket_url,
+        'price': price_val,
+        'title': title,
+    }
@@ -3,6 +3,7 @@ import pandas as pd
 import requests
 
 from config import de_balie as de_balie_config
+from utils.http_utils import safe_get
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -65,7 +66,7 @@ def post_process(df: pd.DataFrame) -> pd.DataFrame:
 def api_call() -> requests.Response:
     """Call De Balie API."""
     url = de_balie_config.BASE_URL + de_balie_config.API_ENDPOINT
-    response = requests.get(
+    response = safe_get(
         url, headers=de_balie_config.HEADERS, params=de_balie_config.QUERY_PARAMS
     )
     return response
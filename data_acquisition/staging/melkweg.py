@@ -1,55 +1,86 @@
 import json
 import re
-from io import StringIO
+from datetime import datetime
+from pathlib import Path
 
 import pandas as pd
 import requests
 
 from config import melkweg as melkweg_config
+from utils.http_utils import json_records, safe_get
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Last build ID that returned data; reused until the data API answers 404
+BUILD_ID_FILE = Path("data/melkweg_build_id.json")
+
 
 def _get_melkweg_build_id() -> str:
-    """Fetch the current Next.js build ID from Melkweg website."""
+    """Fetch the current Next.js build ID from the Melkweg agenda page."""
+    response = safe_get(melkweg_config.WEBSITE_URL, timeout=10)
+    match = re.search(r'"buildId":"([^"]+)"', response.text)
+    if not match:
+        raise ValueError(f"No buildId in {melkweg_config.WEBSITE_URL}")
+    build_id = match.group(1)
+    logger.info(f"Fetched Melkweg build ID: {build_id}")
+    return build_id
+
+
+def _load_build_id() -> str | None:
+    """The last build ID that returned data, if one was stored."""
     try:
-        response = requests.get(melkweg_config.WEBSITE_URL, timeout=10)
-        match = re.search(r'"buildId":"([^"]+)"', response.text)
-        if match:
-            build_id = match.group(1)
-            logger.info(f"Fetched Melkweg build ID: {build_id}")
-            return build_id
+        with open(BUILD_ID_FILE) as f:
+            return json.load(f).get("build_id")
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        logger.warning(f"Failed to fetch build ID: {e}. Using fallback.")
-    return melkweg_config.FALLBACK_BUILD_ID
+        logger.warning(f"Failed to read {BUILD_ID_FILE}: {e}")
+        return None
+
+
+def _save_build_id(build_id: str) -> None:
+    BUILD_ID_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_ID_FILE, "w") as f:
+        json.dump({"build_id": build_id, "saved_at": datetime.now().isoformat()}, f)
+
+
+def _data_request(build_id: str) -> requests.Response:
+    url = f"{melkweg_config.BASE_URL}{melkweg_config.API_ENDPOINT}".format(build_id=build_id)
+    return safe_get(url, headers=melkweg_config.HEADERS, params=melkweg_config.QUERY_PARAMS)
 
 
 def scrape() -> pd.DataFrame:
     """Scrape Melkweg events from API and return as DataFrame."""
     response = api_call()
-    json_data = json.loads(response.text)
-    out = []
-    for x in json_data['pageProps']['pageData']['attributes']['content'][0]['attributes'][
-        'initialEvents'
-    ]:
-        out.append(x['attributes'])
-    json_string = json.dumps(out)
-
-    df = pd.read_json(StringIO(json_string))
+    df = json_records(
+        response,
+        melkweg_config.EVENTS_PATH,
+        melkweg_config.EVENT_SCHEMA,
+        item_path=melkweg_config.EVENT_ITEM_PATH,
+    )
     logger.info(f"Scraped {len(df)} Melkweg events")
 
     return df
 
 
 def api_call() -> requests.Response:
-    """Call Melkweg API with current build ID."""
-    build_id = _get_melkweg_build_id()
-    url = f"https://www.melkweg.nl{melkweg_config.API_ENDPOINT}".format(build_id=build_id)
+    """
+    Call the Melkweg data API, trying the stored build ID first.
 
-    payload = ""
-    response = requests.request(
-        "GET", url, data=payload, headers=melkweg_config.HEADERS, params=melkweg_config.QUERY_PARAMS
-    )
+    Next.js answers 404 for a build ID that is no longer deployed; only then is
+    the agenda page downloaded to look up the current one, which is stored
+    once it returns data.
+    """
+    build_id = _load_build_id()
+    if build_id:
+        response = _data_request(build_id)
+        if response.status_code != 404:
+            return response
+        logger.info(f"Melkweg build ID {build_id} is no longer deployed; fetching the current one")
 
+    build_id = _get_melkweg_build_id()
+    response = _data_request(build_id)
+    if response.status_code == 200:
+        _save_build_id(build_id)
     return response
@@ -1,31 +1,92 @@
-import json
-from io import StringIO
+from collections.abc import Iterator
+from datetime import date, timedelta
 
 import pandas as pd
-import requests
 
 from config import paradiso as paradiso_config
+from utils.http_utils import fast_json, json_path, records_frame, safe_post
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-def scrape() -> pd.DataFrame:
-    """Query Paradiso GraphQL API and return events as DataFrame."""
-    url = paradiso_config.URL
+def _date_window(today: date | None = None) -> tuple[str, str]:
+    """Start dates to request: from today up to WINDOW_DAYS ahead."""
+    today = today or date.today()
+    end = today + timedelta(days=paradiso_config.WINDOW_DAYS)
+    return today.isoformat(), end.isoformat()
+
+
+def _cursor(event: dict) -> list[str] | None:
+    """searchAfter value continuing after `event` (its sort key, as strings)."""
+    sort = event.get('sort')
+    if sort is None:
+        return None
+    return [str(v) for v in sort] if isinstance(sort, list) else [str(sort)]
+
+
+def fetch_event_pages(today: date | None = None) -> Iterator[list[dict]]:
+    """
+    Yield the programme page by page, advancing `searchAfter` until it is exhausted.
 
-    payload = {
-        "query": paradiso_config.QUERY,
-        "variables": paradiso_config.VARIABLES,
-        "operationName": "programItemsQuery"
+    A page shorter than PAGE_SIZE, an event without a sort key, a repeated
+    cursor or MAX_PAGES pages end the pagination.
+    """
+    gte, lte = _date_window(today)
+    variables = {
+        **paradiso_config.VARIABLES,
+        "size": paradiso_config.PAGE_SIZE,
+        "gteStartDateTime": gte,
+        "lteStartDateTime": lte,
     }
+    seen = set()
+    for page in range(1, paradiso_config.MAX_PAGES + 1):
+        payload = {
+            "query": paradiso_config.QUERY,
+            "variables": variables,
+            "operationName": "programItemsQuery"
+        }
+        response = safe_post(
+            paradiso_config.URL,
+            json_body=payload,
+            headers=paradiso_config.HEADERS,
+            timeout=paradiso_config.TIMEOUT,
+        )
+        response.raise_for_status()
+        events = json_path(fast_json(response), 'data.program.events') or []
+        logger.debug(f"Paradiso page {page}: {len(events)} events")
+        if events:
+            yield events
 
-    response = requests.request("POST", url, json=payload, headers=paradiso_config.HEADERS)
+        cursor = _cursor(events[-1]) if events else None
+        if len(events) < paradiso_config.PAGE_SIZE or cursor is None or tuple(cursor) in seen:
+            return
+        seen.add(tuple(cursor))
+        variables = {**variables, "searchAfter": cursor}
+    logger.warning(f"Stopped Paradiso pagination after {paradiso_config.MAX_PAGES} pages")
 
-    json_data = json.loads(response.text)
-    json_string = json.dumps(json_data['data']['program']['events'])
 
-    df = pd.read_json(StringIO(json_string))
-    logger.info(f"Scraped {len(df)} Paradiso events")
+def fetch_event_batches(today: date | None = None) -> Iterator[pd.DataFrame]:
+    """The programme as one DataFrame per page, so callers can process it incrementally.
+
+    Memory only stays flat for callers that consume the pages one at a time;
+    `scrape()` collects them all.
+    """
+    for events in fetch_event_pages(today):
+        yield records_frame(events, paradiso_config.EVENT_SCHEMA)
+
+
+def scrape() -> pd.DataFrame:
+    """Query Paradiso GraphQL API and return events as DataFrame.
+
+    Collects every page: the pipeline maps, validates and writes a venue as one
+    frame, so memory grows with the length of the programme.
+    """
+    batches = list(fetch_event_batches())
+    df = pd.concat(batches, ignore_index=True) if batches else pd.DataFrame()
+    if not df.empty and 'id' in df.columns:
+        # Pages can overlap when the programme changes while paginating
+        df = df.drop_duplicates(subset='id', ignore_index=True)
+    logger.info(f"Scraped {len(df)} Paradiso events in {len(batches)} pages")
 
     return df
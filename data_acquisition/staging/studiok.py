@@ -1,10 +1,12 @@
+import asyncio
 from datetime import datetime, timedelta
 
 import pandas as pd
 from bs4 import BeautifulSoup
 
 from config import studiok as studiok_config
-from utils.http_utils import safe_json, safe_post
+from utils.async_http_utils import async_safe_post, gather_bounded
+from utils.http_utils import safe_json
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -24,16 +26,20 @@ def scrape() -> pd.DataFrame:
 
 def retrieve(start_date: datetime, days: int) -> pd.DataFrame:
     """Fetch events for the next N days."""
+    check_dates = [start_date + timedelta(days=i) for i in range(0, days)]
     events = []
-    for i in range(0, days):
-        check_date = start_date + timedelta(days=i)
-        day_events = api_call(check_date)
+    for day_events in asyncio.run(_fetch_days(check_dates)):
         events.extend(day_events)
     
     df = pd.DataFrame(events)
     return df
 
 
+async def _fetch_days(check_dates: list[datetime]) -> list[list]:
+    """Query the per-day endpoint concurrently, in date order."""
+    return await gather_bounded(api_call(d) for d in check_dates)
+
+
 def post_process(df: pd.DataFrame) -> pd.DataFrame:
     """Transform Studio K data to common schema."""
     if df.empty:
@@ -55,7 +61,7 @@ def post_process(df: pd.DataFrame) -> pd.DataFrame:
 # `scrape` is the canonical entrypoint for this module.
 
 
-def api_call(check_date: datetime) -> list:
+async def api_call(check_date: datetime) -> list:
     """Call Studio K API for a specific date."""
     date_str = check_date.strftime('%Y-%m-%d')
     
@@ -63,7 +69,9 @@ def api_call(check_date: datetime) -> list:
     payload = f"action=loadShows&date={date_str}"
     
     try:
-        response = safe_post(url, data=payload, headers=studiok_config.HEADERS, timeout=10)
+        response = await async_safe_post(
+            url, data=payload, headers=studiok_config.HEADERS, timeout=10
+        )
         response.raise_for_status()
         
         try:
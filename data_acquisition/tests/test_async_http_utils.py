@@ -0,0 +1,56 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import asyncio  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+
+from utils import async_http_utils  # noqa: E402
+from utils.async_http_utils import HostLimiter, gather_bounded  # noqa: E402
+
+
+def test_gather_bounded_keeps_order_and_limit():
+    running = 0
+    peak = 0
+
+    async def work(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (5 - i % 5))
+        running -= 1
+        return i
+
+    results = asyncio.run(gather_bounded((work(i) for i in range(10)), limit=3))
+    assert results == list(range(10))
+    assert peak == 3
+
+
+def test_host_limiter_caps_concurrency_per_host(monkeypatch):
+    lock = threading.Lock()
+    active = {}
+    peak = {}
+
+    def fake_send(method, url, headers, params, data, json_body, timeout, max_age):
+        host = url.split('/')[2]
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        return url
+
+    monkeypatch.setattr(async_http_utils, '_send', fake_send)
+    limiter = HostLimiter(max_per_host=2, delay=0)
+
+    urls = [f'https://a.example/{i}' for i in range(6)]
+    urls += [f'https://b.example/{i}' for i in range(6)]
+    results = asyncio.run(
+        gather_bounded(async_http_utils.async_safe_get(u, limiter=limiter) for u in urls)
+    )
+    assert results == urls
+    assert peak == {'a.example': 2, 'b.example': 2}
@@ -0,0 +1,61 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import asyncio  # noqa: E402
+from types import SimpleNamespace  # noqa: E402
+
+from utils.browser_pool import BrowserPool  # noqa: E402
+
+
+class FakeRoute:
+    def __init__(self, resource_type):
+        self.request = SimpleNamespace(resource_type=resource_type)
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+
+def test_only_document_and_rendering_requests_are_loaded():
+    pool = BrowserPool()
+    outcomes = {}
+    for resource_type in ["document", "script", "xhr", "image", "font", "stylesheet", "media"]:
+        route = FakeRoute(resource_type)
+        asyncio.run(pool._route(route))
+        outcomes[resource_type] = route.outcome
+
+    assert [t for t, o in outcomes.items() if o == "continued"] == ["document", "script", "xhr"]
+
+
+def test_render_all_keeps_order_and_isolates_failures():
+    class FakePage:
+        async def goto(self, url, wait_until):
+            if "slow" in url:
+                await asyncio.sleep(1)
+            if "broken" in url:
+                raise RuntimeError("net::ERR_FAILED")
+            self.url = url
+
+        async def content(self):
+            return f"<html>{self.url}</html>"
+
+        async def close(self):
+            pass
+
+    class FakeContext:
+        async def new_page(self):
+            return FakePage()
+
+    async def run():
+        pool = BrowserPool(max_pages=2, page_timeout=0.1)
+        pool._context = FakeContext()
+        pool._semaphore = asyncio.Semaphore(pool.max_pages)
+        return await pool.render_all(["https://a", "https://broken", "https://slow", "https://b"])
+
+    assert asyncio.run(run()) == ["<html>https://a</html>", None, None, "<html>https://b</html>"]
@@ -0,0 +1,146 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import asyncio  # noqa: E402
+
+import requests  # noqa: E402
+
+import staging.carre as carre  # noqa: E402
+from utils import browser_pool  # noqa: E402
+from utils.browser_pool import LazyBrowserPool  # noqa: E402
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://carre.nl/sitemap-voorstellingen.xml</loc></sitemap>
+</sitemapindex>"""
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://carre.nl/voorstelling/show-a</loc><lastmod>2025-12-01</lastmod></url>
+  <url><loc>https://carre.nl/voorstelling/show-b/</loc><lastmod>2025-12-02</lastmod></url>
+  <url><loc>https://carre.nl/over-carre</loc></url>
+</urlset>"""
+
+HOMEPAGE = b"""<html><a href="/voorstelling/show-a">Show A</a>
+<script>window.__STATE__ = {"url": "https:\\/\\/carre.nl\\/voorstelling\\/show-c"}</script>
+</html>"""
+
+
+def _response(status_code, content):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = content
+    resp.encoding = "utf-8"
+    return resp
+
+
+def _serve(pages, monkeypatch):
+    def fake_get(url, **kwargs):
+        return _response(200, pages[url]) if url in pages else _response(404, b"")
+    monkeypatch.setattr(carre, "safe_get", fake_get)
+
+
+def _discover():
+    async def run():
+        async with LazyBrowserPool() as browser:
+            return await carre._discover_productions(browser)
+    return asyncio.run(run())
+
+
+def test_productions_are_discovered_from_the_sitemap_index(monkeypatch):
+    _serve({
+        "https://carre.nl/sitemap.xml": SITEMAP_INDEX,
+        "https://carre.nl/sitemap-voorstellingen.xml": SITEMAP,
+    }, monkeypatch)
+
+    productions = _discover()
+
+    assert productions == {
+        "https://carre.nl/voorstelling/show-a": carre.fingerprint("2025-12-01"),
+        "https://carre.nl/voorstelling/show-b": carre.fingerprint("2025-12-02"),
+    }
+
+
+def test_static_homepage_is_used_without_a_sitemap(monkeypatch):
+    _serve({"https://carre.nl": HOMEPAGE}, monkeypatch)
+
+    assert list(_discover()) == [
+        "https://carre.nl/voorstelling/show-a",
+        "https://carre.nl/voorstelling/show-c",
+    ]
+
+
+class FakePool:
+    """Stands in for BrowserPool: renders canned pages and records every launch."""
+
+    launched = []
+
+    def __init__(self, **options):
+        self.rendered = []
+
+    async def __aenter__(self):
+        FakePool.launched.append(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def render(self, url, evaluate=None):
+        self.rendered.append(url)
+        return [[production, "Show"] for production in PRODUCTIONS]
+
+    async def render_all(self, urls):
+        self.rendered.extend(urls)
+        return [f'<h1>{url}</h1><time datetime="2025-12-21T19:00:00Z"></time>' for url in urls]
+
+
+PRODUCTIONS = [f"https://carre.nl/voorstelling/show-{i}" for i in range(5)]
+
+
+def test_one_browser_renders_discovery_and_only_failed_productions(monkeypatch):
+    # No sitemap and no static homepage: discovery has to render the homepage
+    _serve({}, monkeypatch)
+    monkeypatch.setattr(FakePool, "launched", [])
+    monkeypatch.setattr(browser_pool, "BrowserPool", FakePool)
+    monkeypatch.setattr(carre, "plan_detail_fetches", lambda venue, fps, max_age_hours: (
+        list(fps), {}
+    ))
+    monkeypatch.setattr(carre, "save_detail_state", lambda venue, fps, fetched: None)
+    monkeypatch.setattr(carre.carre_config, "MAX_RENDERED_PAGES", 2)
+
+    async def fake_fetch(to_fetch):
+        # show-0 has an API response; every other production fails
+        return [
+            [{"venue": carre.VENUE, "start_date_time": "2025-12-20T19:00:00Z", "title": "Show 0"}]
+            if url.endswith("show-0") else None
+            for url in to_fetch
+        ]
+
+    monkeypatch.setattr(carre, "_fetch_productions", fake_fetch)
+
+    df = carre.scrape()
+
+    assert len(FakePool.launched) == 1
+    assert FakePool.launched[0].rendered == ["https://carre.nl", *PRODUCTIONS[1:3]]
+    assert df["title"].tolist() == ["Show 0", PRODUCTIONS[1], PRODUCTIONS[2]]
+
+
+def test_no_browser_is_started_when_none_is_needed(monkeypatch):
+    _serve({"https://carre.nl": HOMEPAGE}, monkeypatch)
+    monkeypatch.setattr(FakePool, "launched", [])
+    monkeypatch.setattr(browser_pool, "BrowserPool", FakePool)
+    monkeypatch.setattr(carre, "plan_detail_fetches", lambda venue, fps, max_age_hours: (
+        list(fps), {}
+    ))
+    monkeypatch.setattr(carre, "save_detail_state", lambda venue, fps, fetched: None)
+
+    async def fake_fetch(to_fetch):
+        return [[] for _ in to_fetch]
+
+    monkeypatch.setattr(carre, "_fetch_productions", fake_fetch)
+
+    assert carre.scrape().empty
+    assert FakePool.launched == []
@@ -0,0 +1,57 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import importlib  # noqa: E402
+
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from utils.column_mapping import (  # noqa: E402
+    apply_column_mapping,
+    apply_row_mapping,
+    map_records,
+)
+
+VENUES = ['carre', 'concertgebouw', 'de_balie', 'fchyena', 'melkweg', 'paradiso', 'studiok']
+
+RAW = pd.DataFrame(
+    {
+        'title': ['Show A', '', None, 'Show D', 'Show E', 'Show F'],
+        'name': ['alt A', 'alt B', None, None, 'alt E', ''],
+        'summary': [None, None, 'sum C', None, None, None],
+        'start_date_time': ['2025-12-01 20:00', None, '2025-12-03 19:30', '', 'x', 'y'],
+        'startDateTime': ['2025-12-01T20:00', None, '', 'a', 'b', 'c'],
+        'startDate': [None, '2025-12-02', '2025-12-03', None, 'b2', None],
+        'ticket_url': ['https://t/a', None, '', 'https://t/d', 'e', 'f'],
+        'uri': ['agenda/a', None, '', 'agenda/d', None, 'agenda/f'],
+        'url': [None, 'agenda/b', 'agenda/c', None, None, None],
+        'price': ['€ 12,50', '', None, '20', 'gratis', 0],
+    }
+)
+
+
+def _normalized(df):
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+@pytest.mark.parametrize('venue', VENUES)
+def test_column_mapping_matches_row_mapping(venue):
+    module = importlib.import_module(f'mapping.{venue}_mapping')
+    map_func = getattr(module, f'map_{venue}')
+
+    by_row = apply_row_mapping(RAW, map_func)
+    by_column = apply_column_mapping(RAW, module.COLUMN_MAPPING)
+
+    assert list(by_column.columns) == list(by_row.columns)
+    assert _normalized(by_column) == _normalized(by_row)
+
+
+def test_map_records_falls_back_to_row_function():
+    def map_plain(row):
+        return {'venue': 'Plain', 'event_name': row.get('title')}
+
+    df = map_records(RAW, map_plain)
+    assert df['event_name'].tolist()[:2] == ['Show A', '']
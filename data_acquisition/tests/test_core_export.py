@@ -0,0 +1,104 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+import core.export as export  # noqa: E402
+import core.transform as transform  # noqa: E402
+
+
+def _frame(venue, *names):
+    return pd.DataFrame([
+        {
+            "venue": venue,
+            "event_type": "Concert",
+            "event_name": name,
+            "start_date_time": "2025-12-20 20:00",
+            "ticket_url": "https://example/event",
+            "price": 10.0,
+        }
+        for name in names
+    ])
+
+
+def test_export_history_partitions_by_date_and_venue(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    history = tmp_path / "history"
+    transform.write_core_batch(
+        [_frame("Carré", "a1"), _frame("Studio K", "b1")], as_of_date="2025-12-01"
+    )
+    transform.write_core_batch([_frame("Carré", "a2")], as_of_date="2025-12-02")
+
+    assert export.export_history(transform.DB_FILE, history) == ["2025-12-01", "2025-12-02"]
+    # Only the newest snapshot is exported again; it replaces its partition as a whole
+    transform.write_core_batch([_frame("Carré", "a3")], as_of_date="2025-12-02")
+    assert export.export_history(transform.DB_FILE, history) == ["2025-12-02"]
+
+    con = duckdb.connect()
+    rows = con.execute(
+        f"SELECT CAST(as_of_date AS VARCHAR), venue, event_name "
+        f"FROM {export.history_query(history)} ORDER BY ALL"
+    ).fetchall()
+    con.close()
+    assert rows == [
+        ("2025-12-01", "Carré", "a1"),
+        ("2025-12-01", "Studio K", "b1"),
+        ("2025-12-02", "Carré", "a3"),
+    ]
+    assert len(list(history.glob("as_of_date=*/venue=*/*.parquet"))) == 3
+
+    assert export.prune_history(0, transform.DB_FILE, history) == 3
+
+
+def test_export_serving_db_holds_only_served_tables(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    transform.write_core_batch([_frame("Carré", "a1")], as_of_date="2025-12-01")
+    transform.write_core_batch([_frame("Carré", "a1")], as_of_date="2025-12-02")
+
+    out = export.export_serving_db(transform.DB_FILE, tmp_path / "serving" / "events.duckdb")
+
+    con = duckdb.connect(str(out), read_only=True)
+    tables = sorted(r[0] for r in con.execute("SHOW TABLES").fetchall())
+    latest = con.execute("SELECT COUNT(*) FROM events_latest").fetchone()[0]
+    con.close()
+    assert tables == ["events_daily_counts", "events_latest"]
+    assert latest == 1
+
+
+def test_export_history_follows_scd2_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    history = tmp_path / "history_scd2"
+    transform.write_core_batch(
+        [_frame("Carré", "a1"), _frame("Studio K", "b1")],
+        as_of_date="2025-12-01",
+        history_model="scd2",
+    )
+    assert export.export_history(
+        transform.DB_FILE, history, history_model="scd2"
+    ) == ["Carré", "Studio K"]
+
+    # a1 disappears: its version is closed, and the export is rewritten as a whole
+    transform.write_core_batch(
+        [_frame("Carré", "a2")], as_of_date="2025-12-02", history_model="scd2"
+    )
+    export.export_history(transform.DB_FILE, history, history_model="scd2")
+
+    con = duckdb.connect()
+    rows = con.execute(
+        f"SELECT venue, event_name, CAST(valid_from AS VARCHAR), CAST(valid_to AS VARCHAR) "
+        f"FROM {export.history_query(history, 'scd2')} ORDER BY ALL"
+    ).fetchall()
+    con.close()
+    assert rows == [
+        ("Carré", "a1", "2025-12-01", "2025-12-02"),
+        ("Carré", "a2", "2025-12-02", None),
+        ("Studio K", "b1", "2025-12-01", None),
+    ]
+
+    with pytest.raises(ValueError):
+        export.prune_history(0, transform.DB_FILE, history_model="scd2")
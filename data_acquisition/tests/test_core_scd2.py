@@ -0,0 +1,100 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+import core.transform as transform  # noqa: E402
+from core.migrate import migrate_scd2  # noqa: E402
+
+
+def _event(name, price=10.0):
+    return {
+        "venue": "Carré",
+        "event_type": "Concert",
+        "event_name": name,
+        "start_date_time": "2025-12-20 20:00",
+        "ticket_url": "https://example/event",
+        "price": price,
+    }
+
+
+# a disappears on the 4th and comes back; b changes price on the 2nd; c is new on the 3rd
+DAYS = [
+    ("2025-12-01", [_event("a"), _event("b")]),
+    ("2025-12-02", [_event("a"), _event("b", 12.0)]),
+    ("2025-12-03", [_event("a"), _event("b", 12.0), _event("c")]),
+    ("2025-12-04", [_event("b", 12.0), _event("c")]),
+    ("2025-12-05", [_event("a"), _event("b", 12.0), _event("c")]),
+]
+
+EXPECTED = [
+    ("a", 10.0, "2025-12-01", "2025-12-04"),
+    ("a", 10.0, "2025-12-05", None),
+    ("b", 10.0, "2025-12-01", "2025-12-02"),
+    ("b", 12.0, "2025-12-02", None),
+    ("c", 10.0, "2025-12-03", None),
+]
+
+
+def _write_days(history_model, days=DAYS):
+    for day, rows in days:
+        transform.write_core_batch(
+            [pd.DataFrame(rows)], as_of_date=day, history_model=history_model
+        )
+
+
+def _history(db_file):
+    con = duckdb.connect(str(db_file))
+    rows = con.execute(
+        "SELECT event_name, price, CAST(valid_from AS VARCHAR), CAST(valid_to AS VARCHAR) "
+        "FROM events_history ORDER BY ALL"
+    ).fetchall()
+    latest = con.execute("SELECT event_name FROM events_latest ORDER BY ALL").fetchall()
+    con.close()
+    return rows, latest
+
+
+def test_scd2_writes_only_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    _write_days("scd2")
+    # Re-running the last day replaces it instead of adding versions
+    day, rows = DAYS[-1]
+    transform.write_core_batch([pd.DataFrame(rows)], as_of_date=day, history_model="scd2")
+
+    rows, latest = _history(transform.DB_FILE)
+    assert rows == EXPECTED
+    assert latest == [("a",), ("b",), ("c",)]
+
+    # Days before the newest version cannot be written without rewriting history
+    day, rows = DAYS[0]
+    with pytest.raises(ValueError):
+        transform.write_core_batch([pd.DataFrame(rows)], as_of_date=day, history_model="scd2")
+
+
+def test_scd2_latest_leaves_out_events_that_disappeared(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    # Up to the 4th, when a is missing from the scrape
+    _write_days("scd2", DAYS[:4])
+
+    assert _history(transform.DB_FILE)[1] == [("b",), ("c",)]
+
+    migrate_db = tmp_path / "migrated.duckdb"
+    monkeypatch.setattr(transform, "DB_FILE", migrate_db)
+    _write_days("snapshot", DAYS[:4])
+    migrate_scd2(migrate_db)
+
+    assert _history(migrate_db)[1] == [("b",), ("c",)]
+
+
+def test_migrate_scd2_matches_incremental_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    _write_days("snapshot")
+
+    migrate_scd2(transform.DB_FILE)
+
+    assert _history(transform.DB_FILE) == (EXPECTED, [("a",), ("b",), ("c",)])
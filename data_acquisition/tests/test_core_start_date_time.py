@@ -0,0 +1,93 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from core.transform import (  # noqa: E402
+    migrate_start_date_time,
+    normalize_start_date_time,
+    write_core_batch,
+)
+
+
+def test_normalize_start_date_time_localizes_naive_values():
+    values = pd.Series([
+        "2025-12-20 21:00",
+        "2025-12-20T21:00:00+00:00",
+        pd.Timestamp("2025-07-01 20:00", tz="Europe/Amsterdam"),
+        "not a date",
+    ])
+    result = normalize_start_date_time(values)
+
+    assert str(result.dtype) == "datetime64[ns, UTC]"
+    # Naive strings are Amsterdam local time (CET in December)
+    assert result.iloc[0] == pd.Timestamp("2025-12-20 20:00", tz="UTC")
+    assert result.iloc[1] == pd.Timestamp("2025-12-20 21:00", tz="UTC")
+    assert result.iloc[2] == pd.Timestamp("2025-07-01 18:00", tz="UTC")
+    assert pd.isna(result.iloc[3])
+
+
+def test_normalize_start_date_time_handles_dst_and_typed_columns():
+    values = pd.Series([
+        "2025-03-30 02:30",  # does not exist in Amsterdam: shifted forward to 03:00 CEST
+        "2025-10-26 02:30",  # exists twice: ambiguous, so NaT
+        pd.Timestamp("2025-07-01 20:00"),
+        "2025-07-01T20:00:00Z",
+        None,
+    ])
+    result = normalize_start_date_time(values)
+
+    assert result.iloc[0] == pd.Timestamp("2025-03-30 01:00", tz="UTC")
+    assert pd.isna(result.iloc[1])
+    assert result.iloc[2] == pd.Timestamp("2025-07-01 18:00", tz="UTC")
+    assert result.iloc[3] == pd.Timestamp("2025-07-01 20:00", tz="UTC")
+    assert pd.isna(result.iloc[4])
+
+    typed = pd.Series(pd.to_datetime(["2025-12-20 21:00"]))
+    assert normalize_start_date_time(typed).iloc[0] == pd.Timestamp("2025-12-20 20:00", tz="UTC")
+
+
+def test_migrate_start_date_time_converts_varchar_column():
+    con = duckdb.connect()
+    con.execute("SET TimeZone = 'UTC'")
+    con.execute(
+        "CREATE TABLE events AS SELECT * FROM (VALUES "
+        "('2025-12-20 21:00'), ('2025-12-20T21:00:00+00:00'), ('2025-12-21')"
+        ") t(start_date_time)"
+    )
+
+    assert migrate_start_date_time(con) is True
+    col_type = con.execute(
+        "SELECT type FROM pragma_table_info('events') WHERE name = 'start_date_time'"
+    ).fetchone()[0]
+    hours = [r[0] for r in con.execute("SELECT hour(start_date_time) FROM events").fetchall()]
+    # A second run is a no-op
+    assert migrate_start_date_time(con) is False
+    con.close()
+
+    assert col_type == "TIMESTAMP WITH TIME ZONE"
+    # "2025-12-21" has no time of day, so it is not mistaken for a UTC offset
+    assert hours == [20, 21, 23]
+
+
+def test_rows_without_a_resolvable_start_time_are_not_stored(tmp_path):
+    db_file = tmp_path / "events.duckdb"
+    df = pd.DataFrame({
+        "venue": "Paradiso",
+        "event_type": "Concert",
+        "event_name": ["On time", "TBA", "Ambiguous"],
+        "start_date_time": ["2025-12-20 21:00", "TBA", "2025-10-26 02:30"],
+        "ticket_url": "https://example/event",
+        "price": 10.0,
+    })
+    write_core_batch([df], as_of_date="2025-12-16", history_model="snapshot", db_file=db_file)
+
+    con = duckdb.connect(str(db_file))
+    stored = con.execute("SELECT event_name FROM events").fetchall()
+    latest = con.execute("SELECT event_name FROM events_latest").fetchall()
+    con.close()
+    assert stored == latest == [("On time",)]
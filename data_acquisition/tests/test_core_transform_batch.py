@@ -0,0 +1,62 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+import core.transform as transform  # noqa: E402
+
+
+def _frame(venue, *names):
+    return pd.DataFrame([
+        {
+            "venue": venue,
+            "event_type": "Concert",
+            "event_name": name,
+            "start_date_time": "2025-12-20 20:00",
+            "ticket_url": "https://example/event",
+            "price": 10.0,
+        }
+        for name in names
+    ])
+
+
+def _events(db_file):
+    con = duckdb.connect(str(db_file))
+    rows = con.execute("SELECT venue, event_name FROM events ORDER BY ALL").fetchall()
+    latest = con.execute("SELECT count(*) FROM events_latest").fetchone()[0]
+    con.close()
+    return rows, latest
+
+
+def test_write_core_batch_replaces_venues_for_the_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+
+    transform.write_core_batch(
+        [_frame("O'Reilly Hall", "a1", "a2"), _frame("Beta", "b1")], as_of_date="2025-12-16"
+    )
+    transform.write_core_batch([_frame("O'Reilly Hall", "a3")], as_of_date="2025-12-16")
+
+    rows, latest = _events(transform.DB_FILE)
+    assert rows == [("Beta", "b1"), ("O'Reilly Hall", "a3")]
+    assert latest == 2
+
+
+def test_failed_write_core_batch_leaves_database_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    transform.write_core_batch([_frame("Alpha", "a1")], as_of_date="2025-12-16")
+
+    def fail(con):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(transform, "refresh_daily_counts", fail)
+    with pytest.raises(RuntimeError):
+        transform.write_core_batch(
+            [_frame("Alpha", "a2"), _frame("Beta", "b1")], as_of_date="2025-12-16"
+        )
+
+    assert _events(transform.DB_FILE) == ([("Alpha", "a1")], 1)
@@ -0,0 +1,106 @@
+import pathlib
+import sys
+from pathlib import Path
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import core.transform as transform  # noqa: E402
+
+
+def _event(venue, name, start, price):
+    return {
+        "venue": venue,
+        "event_type": "Concert",
+        "event_name": name,
+        "start_date_time": start,
+        "ticket_url": "https://example/event",
+        "price": price,
+    }
+
+
+def test_write_core_records_refreshes_latest_table(tmp_path):
+    db_file = tmp_path / "events.duckdb"
+    original_db = transform.DB_FILE
+    try:
+        transform.DB_FILE = Path(db_file)
+        transform.write_core_records(
+            pd.DataFrame([
+                _event("Melkweg", "Band A", "2025-12-20 21:00", 20.0),
+                _event("Paradiso", "Band B", "2025-12-21 21:00", 25.0),
+            ]),
+            as_of_date="2025-12-16",
+        )
+        transform.write_core_records(
+            pd.DataFrame([_event("Melkweg", "Band A", "2025-12-20 21:00", 22.0)]),
+            as_of_date="2025-12-17",
+        )
+    finally:
+        transform.DB_FILE = original_db
+
+    con = duckdb.connect(database=str(db_file))
+    rows = con.execute(
+        "SELECT venue, price, as_of_date FROM events_latest ORDER BY venue"
+    ).fetchall()
+    con.close()
+
+    # One row per event, taken from the most recent snapshot
+    assert rows == [
+        ("Melkweg", 22.0, "2025-12-17"),
+        ("Paradiso", 25.0, "2025-12-16"),
+    ]
+
+
+def test_write_core_records_refreshes_daily_counts(tmp_path):
+    db_file = tmp_path / "events.duckdb"
+    original_db = transform.DB_FILE
+    try:
+        transform.DB_FILE = Path(db_file)
+        transform.write_core_records(
+            pd.DataFrame([
+                _event("Melkweg", "Band A", "2025-12-20 21:00", 20.0),
+                _event("Melkweg", "Band B", "2025-12-20 23:30", 20.0),
+                _event("Paradiso", "Band C", "2025-12-21 00:30", 25.0),
+            ]),
+            as_of_date="2025-12-16",
+        )
+    finally:
+        transform.DB_FILE = original_db
+
+    con = duckdb.connect(database=str(db_file))
+    rows = con.execute(
+        "SELECT CAST(day AS VARCHAR), venue, events FROM events_daily_counts ORDER BY ALL"
+    ).fetchall()
+    con.close()
+
+    # Days are Amsterdam calendar days, not UTC ones
+    assert rows == [("2025-12-20", "Melkweg", 2), ("2025-12-21", "Paradiso", 1)]
+
+
+def test_latest_table_stays_in_start_time_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    transform.write_core_batch(
+        [pd.DataFrame([
+            _event("Melkweg", "Band A", "2025-12-20 21:00", 20.0),
+            _event("Paradiso", "Band B", "2025-12-22 21:00", 25.0),
+        ])],
+        as_of_date="2025-12-16",
+        history_model="snapshot",
+    )
+    # An incremental write for one venue, with events before and after the existing ones
+    transform.write_core_batch(
+        [pd.DataFrame([
+            _event("Melkweg", "Band C", "2025-12-19 21:00", 20.0),
+            _event("Melkweg", "Band D", "2025-12-23 21:00", 20.0),
+        ])],
+        as_of_date="2025-12-17",
+        history_model="snapshot",
+    )
+
+    con = duckdb.connect(str(transform.DB_FILE))
+    names = con.execute("SELECT event_name FROM events_latest ORDER BY rowid").fetchall()
+    con.close()
+    assert names == [("Band C",), ("Band A",), ("Band B",), ("Band D",)]
@@ -0,0 +1,101 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pytest  # noqa: E402
+import requests  # noqa: E402
+
+from utils import http_utils  # noqa: E402
+from utils.http_cache import CacheMiss  # noqa: E402
+
+
+class FakeSession:
+    """Answers like a server whose page has ETag "v1" and records request headers."""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, headers=None, params=None, timeout=None, **kwargs):
+        self.calls.append(dict(headers or {}))
+        resp = requests.Response()
+        resp.url = url
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            resp.status_code = 304
+            resp._content = b''
+        else:
+            resp.status_code = 200
+            resp._content = b'{"page": 1}'
+            resp.headers['ETag'] = '"v1"'
+            resp.headers['Content-Type'] = 'application/json; charset=utf-8'
+        return resp
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(http_utils, 'get_session', lambda url: fake)
+    http_utils.enable_cache(tmp_path / 'cache.sqlite')
+    yield fake
+    http_utils.disable_cache()
+
+
+def test_revalidates_and_serves_304_from_cache(session):
+    first = http_utils.safe_get('https://example.org/event', params={'id': 1})
+    second = http_utils.safe_get('https://example.org/event', params={'id': 1})
+
+    assert 'If-None-Match' not in session.calls[0]
+    assert session.calls[1]['If-None-Match'] == '"v1"'
+    assert second.status_code == 200
+    assert second.headers['X-Cache'] == 'REVALIDATED'
+    assert second.json() == first.json() == {'page': 1}
+
+
+def test_max_age_skips_the_request(session):
+    http_utils.safe_get('https://example.org/event')
+    resp = http_utils.safe_get('https://example.org/event', max_age=3600)
+
+    assert len(session.calls) == 1
+    assert resp.headers['X-Cache'] == 'HIT'
+
+
+def test_offline_serves_cached_and_raises_on_miss(session, tmp_path):
+    http_utils.safe_get('https://example.org/event')
+    http_utils.enable_cache(tmp_path / 'cache.sqlite', offline=True)
+
+    resp = http_utils.safe_get('https://example.org/event')
+    assert resp.json() == {'page': 1}
+    with pytest.raises(CacheMiss):
+        http_utils.safe_get('https://example.org/other')
+    assert len(session.calls) == 1
+
+
+def test_post_is_recorded_for_offline_replay(session, tmp_path):
+    http_utils.safe_post('https://example.org/api', json_body={'day': 1})
+    http_utils.safe_post('https://example.org/api', json_body={'day': 1})
+    assert len(session.calls) == 2
+
+    http_utils.enable_cache(tmp_path / 'cache.sqlite', offline=True)
+    assert http_utils.safe_post('https://example.org/api', json_body={'day': 1}).ok
+    with pytest.raises(CacheMiss):
+        http_utils.safe_post('https://example.org/api', json_body={'day': 2})
+
+
+def test_entries_not_fetched_recently_are_pruned(session, tmp_path):
+    http_utils.safe_get('https://example.org/old')
+    http_utils.safe_get('https://example.org/recent')
+    cache = http_utils._cache
+    with cache._con:
+        cache._con.execute(
+            'UPDATE responses SET fetched_at = fetched_at - 31 * 24 * 60 * 60 WHERE url = ?',
+            ('https://example.org/old',),
+        )
+
+    # Offline replays keep everything that was recorded
+    cache = http_utils.enable_cache(tmp_path / 'cache.sqlite', offline=True)
+    assert cache.get('https://example.org/old') is not None
+
+    cache = http_utils.enable_cache(tmp_path / 'cache.sqlite', keep_days=30)
+    assert cache.get('https://example.org/old') is None
+    assert cache.get('https://example.org/recent') is not None
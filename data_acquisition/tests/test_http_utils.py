@@ -8,7 +8,7 @@ import gzip  # noqa: E402
 import json  # noqa: E402
 import zlib  # noqa: E402
 
-from utils.http_utils import safe_json  # noqa: E402
+from utils.http_utils import json_records, safe_json  # noqa: E402
 
 
 class FakeResp:
@@ -35,3 +35,51 @@ def test_safe_json_zlib():
     resp = FakeResp(z)
     data = safe_json(resp)
     assert data.get('n') == 1
+
+
+def test_get_session_is_shared_per_host():
+    from utils.http_utils import close_sessions, get_session
+
+    try:
+        a = get_session('https://www.concertgebouw.nl/en/concerts/1')
+        b = get_session('https://www.concertgebouw.nl/en/concerts/2?x=1')
+        c = get_session('https://carre.nl/api/render/voorstelling/x')
+        assert a is b
+        assert a is not c
+    finally:
+        close_sessions()
+
+
+def test_configure_pools_applies_to_new_sessions():
+    from utils import http_utils
+
+    original = (http_utils.POOL_CONNECTIONS, http_utils.POOL_MAXSIZE)
+    try:
+        http_utils.configure_pools(pool_maxsize=3)
+        adapter = http_utils.get_session('https://example.org/').get_adapter('https://example.org/')
+        assert adapter._pool_maxsize == 3
+    finally:
+        http_utils.configure_pools(*original)
+
+
+def test_json_records_builds_typed_frame_at_path():
+    body = {
+        'pageProps': {'content': [{'initialEvents': [
+            {'attributes': {'title': 'A', 'price': 12.5, 'soldOut': True, 'room': {'id': 1}}},
+            {'attributes': {'title': 'B', 'soldOut': False}},
+        ]}]}
+    }
+    resp = FakeResp(json.dumps(body).encode())
+
+    df = json_records(
+        resp,
+        'pageProps.content[0].initialEvents',
+        {'title': 'object', 'price': 'float64', 'soldOut': 'boolean', 'uri': 'object'},
+        item_path='attributes',
+    )
+
+    assert list(df.columns) == ['title', 'price', 'soldOut', 'uri', 'room']
+    assert str(df['price'].dtype) == 'float64' and df['price'].isna().tolist() == [False, True]
+    assert df['soldOut'].tolist() == [True, False]
+    assert df['uri'].tolist() == [None, None]
+    assert df['room'].tolist() == [{'id': 1}, None]
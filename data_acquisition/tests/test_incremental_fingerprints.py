@@ -0,0 +1,109 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import json  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+
+import pytest  # noqa: E402
+
+from utils import incremental  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fingerprint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, 'FINGERPRINT_DIR', tmp_path)
+    return tmp_path
+
+
+def test_plan_detail_fetches_only_new_or_changed():
+    first = {'/a': incremental.fingerprint('A 1 dec'), '/b': incremental.fingerprint('B 2 dec')}
+    to_fetch, carried = incremental.plan_detail_fetches('Venue', first)
+    assert to_fetch == ['/a', '/b'] and carried == {}
+    incremental.save_detail_state('Venue', first, {'/a': [{'title': 'A'}]})
+
+    second = {
+        '/a': first['/a'],
+        '/b': first['/b'],
+        '/c': incremental.fingerprint('C 3 dec'),
+    }
+    to_fetch, carried = incremental.plan_detail_fetches('Venue', second)
+    # /b failed last time, so it is retried along with the new /c
+    assert to_fetch == ['/b', '/c']
+    assert carried == {'/a': [{'title': 'A'}]}
+
+    changed = {'/a': incremental.fingerprint('A 1 dec SOLD OUT')}
+    to_fetch, carried = incremental.plan_detail_fetches('Venue', changed)
+    assert to_fetch == ['/a'] and carried == {}
+
+
+def test_plan_detail_fetches_refreshes_stale_entries(fingerprint_dir):
+    fps = {'/a': incremental.fingerprint('A')}
+    incremental.save_detail_state('Venue', fps, {'/a': []})
+    path = fingerprint_dir / 'Venue.json'
+    state = json.loads(path.read_text())
+    state['/a']['fetched_at'] = (datetime.now() - timedelta(hours=50)).isoformat()
+    path.write_text(json.dumps(state))
+
+    assert incremental.plan_detail_fetches('Venue', fps, max_age_hours=72)[0] == []
+    assert incremental.plan_detail_fetches('Venue', fps, max_age_hours=48)[0] == ['/a']
+
+
+def test_concertgebouw_skips_unchanged_event_pages(monkeypatch):
+    from staging import concertgebouw
+
+    listing = (
+        b'<ul><li><a href="/en/concerts/one">One 1 Dec</a></li>'
+        b'<li><a href="/en/concerts/two">Two 2 Dec</a></li></ul>'
+    )
+    fetched = []
+
+    class Resp:
+        def __init__(self, content, status_code=200):
+            self.content = content
+            self.status_code = status_code
+
+    async def fake_get(url, **kwargs):
+        fetched.append(url)
+        name = url.rsplit('/', 1)[-1]
+        return Resp(
+            f'<h1>{name}</h1><time datetime="2025-12-01T20:15:00+01:00"></time>'.encode()
+        )
+
+    monkeypatch.setattr(concertgebouw, 'safe_get', lambda url: Resp(listing))
+    monkeypatch.setattr(concertgebouw, 'async_safe_get', fake_get)
+
+    first = concertgebouw.scrape()
+    assert len(fetched) == 2
+
+    fetched.clear()
+    listing = listing.replace(b'Two 2 Dec', b'Two 2 Dec - sold out')
+    second = concertgebouw.scrape()
+    assert fetched == ['https://www.concertgebouw.nl/en/concerts/two']
+    assert second['title'].tolist() == first['title'].tolist() == ['one', 'two']
+
+
+def test_concertgebouw_retries_event_pages_that_failed(monkeypatch):
+    from staging import concertgebouw
+
+    listing = b'<ul><li><a href="/en/concerts/one">One 1 Dec</a></li></ul>'
+    status = {'code': 503}
+
+    class Resp:
+        def __init__(self, content, status_code=200):
+            self.content = content
+            self.status_code = status_code
+
+    async def fake_get(url, **kwargs):
+        if status['code'] != 200:
+            return Resp(b'<h1>Service Unavailable</h1>', status['code'])
+        return Resp(b'<h1>one</h1><time datetime="2025-12-01T20:15:00+01:00"></time>')
+
+    monkeypatch.setattr(concertgebouw, 'safe_get', lambda url: Resp(listing))
+    monkeypatch.setattr(concertgebouw, 'async_safe_get', fake_get)
+
+    assert concertgebouw.scrape().empty
+    status['code'] = 200
+    assert concertgebouw.scrape()['title'].tolist() == ['one']
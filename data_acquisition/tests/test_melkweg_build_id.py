@@ -0,0 +1,54 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+import staging.melkweg as melkweg  # noqa: E402
+
+
+def _serve(monkeypatch, deployed):
+    """Fake melkweg.nl where only the `deployed` build ID has data; returns the URLs requested."""
+    requested = []
+
+    def fake_get(url, **kwargs):
+        requested.append(url)
+        resp = requests.Response()
+        resp.encoding = "utf-8"
+        if url == melkweg.melkweg_config.WEBSITE_URL:
+            resp.status_code = 200
+            resp._content = f'<script>{{"buildId":"{deployed}"}}</script>'.encode()
+        elif f"/_next/data/{deployed}/" in url:
+            resp.status_code = 200
+            resp._content = b"{}"
+        else:
+            resp.status_code = 404
+            resp._content = b""
+        return resp
+
+    monkeypatch.setattr(melkweg, "safe_get", fake_get)
+    return requested
+
+
+def test_stored_build_id_skips_the_agenda_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(melkweg, "BUILD_ID_FILE", tmp_path / "build_id.json")
+    requested = _serve(monkeypatch, "build-1")
+
+    assert melkweg.api_call().status_code == 200
+    assert melkweg._load_build_id() == "build-1"
+    requested.clear()
+
+    assert melkweg.api_call().status_code == 200
+    assert melkweg.melkweg_config.WEBSITE_URL not in requested
+
+
+def test_build_id_is_refreshed_after_404(tmp_path, monkeypatch):
+    monkeypatch.setattr(melkweg, "BUILD_ID_FILE", tmp_path / "build_id.json")
+    melkweg._save_build_id("build-1")
+    requested = _serve(monkeypatch, "build-2")
+
+    assert melkweg.api_call().status_code == 200
+    assert melkweg._load_build_id() == "build-2"
+    assert len(requested) == 3
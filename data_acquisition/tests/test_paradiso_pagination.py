@@ -0,0 +1,46 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import json  # noqa: E402
+from datetime import date  # noqa: E402
+
+import requests  # noqa: E402
+
+import staging.paradiso as paradiso  # noqa: E402
+from config import paradiso as paradiso_config  # noqa: E402
+
+
+def _event(i):
+    return {"id": i, "uri": f"agenda/{i}", "title": f"Show {i}", "sort": [str(1000 + i), str(i)]}
+
+
+def test_pages_follow_search_after_until_exhausted(monkeypatch):
+    monkeypatch.setattr(paradiso_config, "PAGE_SIZE", 2)
+    programme = [_event(i) for i in range(5)]
+    requests_seen = []
+
+    def fake_post(url, json_body, headers, timeout):
+        variables = json_body["variables"]
+        requests_seen.append(variables)
+        start = 0
+        if variables["searchAfter"]:
+            start = next(
+                i + 1 for i, e in enumerate(programme) if e["sort"] == variables["searchAfter"]
+            )
+        page = programme[start:start + variables["size"]]
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = json.dumps({"data": {"program": {"events": page}}}).encode()
+        return resp
+
+    monkeypatch.setattr(paradiso, "safe_post", fake_post)
+
+    batches = list(paradiso.fetch_event_batches(today=date(2025, 12, 15)))
+
+    assert [b["id"].tolist() for b in batches] == [[0, 1], [2, 3], [4]]
+    assert [v["searchAfter"] for v in requests_seen] == [None, ["1001", "1"], ["1003", "3"]]
+    assert requests_seen[0]["gteStartDateTime"] == "2025-12-15"
+    assert requests_seen[0]["lteStartDateTime"] == "2026-12-15"
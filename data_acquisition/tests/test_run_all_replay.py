@@ -0,0 +1,45 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import duckdb  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+import run_all  # noqa: E402
+from mapping.paradiso_mapping import map_paradiso  # noqa: E402
+from utils.staging_utils import save_raw_snapshot  # noqa: E402
+
+
+def _stage(staging_dir, taken_at, *titles):
+    path = save_raw_snapshot(
+        pd.DataFrame([
+            {"title": t, "startDateTime": "2025-12-20 20:00", "uri": f"agenda/{t}"}
+            for t in titles
+        ]),
+        "Paradiso",
+        keep=None,
+        staging_dir=staging_dir,
+    )
+    path.rename(path.with_name(f"{taken_at}_000000.parquet"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replay_writes_newest_snapshot_per_day(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(run_all, "SCRAPERS", [(None, map_paradiso, "Paradiso")])
+    staging_dir = tmp_path / "staging"
+    _stage(staging_dir, "2025-12-01_08-00-00", "a")
+    _stage(staging_dir, "2025-12-01_20-00-00", "a", "b")
+    _stage(staging_dir, "2025-12-02_08-00-00", "c")
+
+    db_file = tmp_path / "scratch.duckdb"
+    run_all.replay_snapshots(workers=workers, db_file=db_file, staging_dir=staging_dir)
+
+    con = duckdb.connect(str(db_file))
+    rows = con.execute(
+        "SELECT CAST(as_of_date AS VARCHAR), event_name FROM events ORDER BY ALL"
+    ).fetchall()
+    con.close()
+    assert rows == [("2025-12-01", "a"), ("2025-12-01", "b"), ("2025-12-02", "c")]
@@ -0,0 +1,96 @@
+import pathlib
+import sys
+import threading
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd  # noqa: E402
+
+import run_all  # noqa: E402
+
+
+def _scraper(venue):
+    def scrape():
+        if venue == "Broken":
+            raise RuntimeError("site down")
+        return pd.DataFrame([{"title": f"{venue} show", "start_date_time": "2025-12-20 20:00"}])
+    return scrape
+
+
+def _mapper(venue):
+    def map_row(row):
+        return {
+            "venue": venue,
+            "event_type": "Concert",
+            "event_name": row.get("title"),
+            "start_date_time": row.get("start_date_time"),
+            "ticket_url": "https://example/event",
+            "price": None,
+        }
+    return map_row
+
+
+def test_run_all_scrapers_with_workers_serializes_writes(monkeypatch):
+    venues = ["Alpha", "Broken", "Gamma", "Delta"]
+    monkeypatch.setattr(
+        run_all, "SCRAPERS", [(_scraper(v), _mapper(v), v) for v in venues]
+    )
+    monkeypatch.setattr(run_all, "save_raw_snapshot", lambda df, name: None)
+    monkeypatch.setattr(run_all, "should_update", lambda venue: venue != "Delta")
+    monkeypatch.setattr(run_all, "validate_records", lambda df: df)
+
+    batches = []
+    last_run = []
+    monkeypatch.setattr(
+        run_all,
+        "write_core_batch",
+        lambda frames: batches.append(
+            ([df["venue"].iloc[0] for df in frames], threading.current_thread())
+        ),
+    )
+    monkeypatch.setattr(run_all, "set_last_run", last_run.append)
+
+    run_all.run_all_scrapers(workers=3)
+
+    # Broken fails in isolation, Delta is skipped, the rest are written once on the caller thread
+    assert len(batches) == 1
+    venues, thread = batches[0]
+    assert sorted(venues) == ["Alpha", "Gamma"]
+    assert thread is threading.current_thread()
+    assert sorted(last_run) == ["Alpha", "Gamma"]
+
+
+def test_failed_batch_write_marks_no_venue_as_run(monkeypatch):
+    venues = ["Alpha", "Gamma"]
+    monkeypatch.setattr(
+        run_all, "SCRAPERS", [(_scraper(v), _mapper(v), v) for v in venues]
+    )
+    monkeypatch.setattr(run_all, "save_raw_snapshot", lambda df, name: None)
+    monkeypatch.setattr(run_all, "validate_records", lambda df: df)
+
+    def failing_write(frames):
+        raise RuntimeError("database locked")
+
+    last_run = []
+    monkeypatch.setattr(run_all, "write_core_batch", failing_write)
+    monkeypatch.setattr(run_all, "set_last_run", last_run.append)
+
+    run_all.run_all_scrapers(force_update=True)
+
+    assert last_run == []
+
+
+def test_bad_venue_in_batch_write_only_loses_that_venue(tmp_path, monkeypatch):
+    import core.transform as transform
+
+    monkeypatch.setattr(transform, "DB_FILE", tmp_path / "events.duckdb")
+    transform.write_core_batch(
+        [pd.DataFrame([{"venue": "Alpha", "event_name": "a0", "price": 10.0}])],
+        as_of_date="2025-12-15",
+    )
+
+    good = pd.DataFrame([{"venue": "Alpha", "event_name": "a1", "price": 12.5}])
+    bad = pd.DataFrame([{"venue": "Beta", "event_name": "b1", "price": "gratis"}])
+
+    assert run_all.write_venues([("Alpha", good), ("Beta", bad)]) == ["Alpha"]
@@ -0,0 +1,54 @@
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import json  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+import utils.staging_utils as staging  # noqa: E402
+
+
+def _raw():
+    return pd.DataFrame({
+        "title": ["Show A", None],
+        "start_date_time": pd.to_datetime(
+            ["2025-12-20 20:00", "2025-12-21 19:30"]
+        ).tz_localize("Europe/Amsterdam"),
+        "price": ["€ 12,50", 0],
+        "tags": [{"genre": "jazz"}, None],
+    })
+
+
+def test_snapshot_round_trip_keeps_types(tmp_path):
+    path = staging.save_raw_snapshot(_raw(), "Carré", staging_dir=tmp_path)
+
+    assert path.parent.name == "Carr%C3%A9"
+    df = staging.read_raw_snapshot(path)
+    assert list(df.columns) == ["title", "start_date_time", "price", "tags"]
+    assert df["start_date_time"].tolist() == _raw()["start_date_time"].tolist()
+    assert str(df["start_date_time"].dt.tz) == "Europe/Amsterdam"
+    assert df["title"].tolist() == ["Show A", None]
+    # Mixed scalars become text, nested values JSON
+    assert df["price"].tolist() == ["€ 12,50", "0"]
+    assert json.loads(df["tags"].iloc[0]) == {"genre": "jazz"}
+
+
+def test_snapshots_are_listed_per_venue_and_pruned(tmp_path):
+    paths = [
+        staging.save_raw_snapshot(_raw(), "Studio K", keep=2, staging_dir=tmp_path)
+        for _ in range(3)
+    ]
+    other = staging.save_raw_snapshot(_raw(), "Paradiso", keep=2, staging_dir=tmp_path)
+
+    snapshots = staging.list_snapshots("Studio K", staging_dir=tmp_path)
+    assert [s.path for s in snapshots] == paths[1:]
+    assert {s.venue for s in staging.list_snapshots(staging_dir=tmp_path)} == {
+        "Studio K", "Paradiso"
+    }
+    assert staging.latest_snapshot("Paradiso", staging_dir=tmp_path).path == other
+    assert staging.list_snapshots(since=datetime(2100, 1, 1), staging_dir=tmp_path) == []
+    assert staging.save_raw_snapshot(pd.DataFrame(), "Empty", staging_dir=tmp_path) is None
@@ -0,0 +1,124 @@
+"""Asyncio counterpart of `utils.http_utils` for scrapers that fan out over many pages.
+
+Requests reuse the pooled per-host sessions of `http_utils` and run in worker
+threads, so no extra HTTP client dependency is needed. Concurrency is limited
+per host, and request starts to the same host are spaced by a politeness delay.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
+
+import requests
+
+from utils import http_utils
+from utils.http_utils import _log_retry, _send, _with_user_agent
+
+logger = logging.getLogger(__name__)
+
+# Default per-host limits: concurrent requests, and seconds between request starts
+MAX_PER_HOST = 4
+POLITENESS_DELAY = 0.25
+
+
+class HostLimiter:
+    """Per-host concurrency limit plus a minimum delay between request starts."""
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, delay: float = POLITENESS_DELAY):
+        self.max_per_host = max_per_host
+        self.delay = delay
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._next_start: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of the block."""
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start.get(host, 0.0) - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = loop.time() + self.delay
+            yield
+
+
+# asyncio primitives belong to one event loop, so each loop gets its own limiter
+_limiters: WeakKeyDictionary[asyncio.AbstractEventLoop, HostLimiter] = WeakKeyDictionary()
+
+
+def get_host_limiter() -> HostLimiter:
+    """Return the default host limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = HostLimiter()
+    return limiter
+
+
+async def async_safe_request(
+    method: str,
+    url: str,
+    *,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    data: Any | None = None,
+    json_body: Any | None = None,
+    retries: int = 3,
+    backoff: float = 1.0,
+    timeout: float = 10.0,
+    max_age: float | None = None,
+    limiter: HostLimiter | None = None,
+) -> requests.Response:
+    """Async version of `safe_request` with the same retry and backoff semantics.
+
+    Backoff waits do not hold a host slot or a worker thread.
+    """
+    hdrs = _with_user_agent(headers)
+    if http_utils._offline:
+        # Offline replays are served from the cache, so skip the host limits
+        return _send(method, url, hdrs, params, data, json_body, timeout, max_age)
+    limiter = limiter or get_host_limiter()
+    last_exc = None
+    for attempt in range(1, retries + 1):
+        try:
+            async with limiter.slot(url):
+                return await asyncio.to_thread(
+                    _send, method, url, hdrs, params, data, json_body, timeout, max_age
+                )
+        except requests.RequestException as e:
+            last_exc = e
+            wait = _log_retry(method, url, attempt, retries, backoff, e)
+            await asyncio.sleep(wait)
+    # If we get here, all retries failed
+    logger.error("All retries failed for %s %s: %s", method, url, last_exc)
+    raise last_exc
+
+
+async def async_safe_get(url: str, **kwargs) -> requests.Response:
+    return await async_safe_request("GET", url, **kwargs)
+
+
+async def async_safe_post(url: str, **kwargs) -> requests.Response:
+    return await async_safe_request("POST", url, **kwargs)
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable[Any]], limit: int = 16, return_exceptions: bool = False
+) -> list[Any]:
+    """Await all awaitables with at most `limit` running at once; results keep input order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
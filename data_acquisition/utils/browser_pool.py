@@ -0,0 +1,186 @@
+"""Shared headless Chromium for scrapers that need a rendered page.
+
+One browser is started per `BrowserPool` block and reused for every page. Pages
+are rendered in concurrent tabs (bounded by `max_pages`), each with its own
+timeout, and requests for anything but the document and what renders it
+(images, fonts, stylesheets, media, beacons) are aborted before they leave
+the browser.
+
+Playwright is imported lazily, so modules using the pool still import without
+it; entering the pool then raises ImportError.
+
+    async with BrowserPool() as pool:
+        pages = await pool.render_all(urls)
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Concurrent tabs, and seconds a single page may take to load and evaluate
+MAX_PAGES = 4
+PAGE_TIMEOUT = 20.0
+
+# Resource types still loaded; everything else is aborted
+ALLOWED_RESOURCE_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+
+# Collects every link on a rendered page as [href, text] pairs
+LINKS_SCRIPT = "() => Array.from(document.links, a => [a.href, a.innerText])"
+
+
+class BrowserPool:
+    """One headless Chromium, handing out isolated contexts and rendering pages in tabs.
+
+    `render` opens its tabs in one shared context; use `context()` for a session
+    of its own (e.g. cookies that must not leak into other pages).
+    """
+
+    def __init__(
+        self,
+        max_pages: int = MAX_PAGES,
+        page_timeout: float = PAGE_TIMEOUT,
+        allowed_resource_types: Iterable[str] = ALLOWED_RESOURCE_TYPES,
+    ):
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.allowed_resource_types = frozenset(allowed_resource_types)
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self.new_context()
+        except Exception:
+            await self.__aexit__(None, None, None)
+            raise
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+        finally:
+            await self._playwright.stop()
+            self._browser = self._context = self._playwright = None
+
+    async def _route(self, route) -> None:
+        if route.request.resource_type in self.allowed_resource_types:
+            await route.continue_()
+        else:
+            await route.abort()
+
+    async def new_context(self, **options):
+        """A fresh browser context (own cookies and storage) with resource blocking."""
+        context = await self._browser.new_context(**options)
+        context.set_default_timeout(self.page_timeout * 1000)
+        await context.route("**/*", self._route)
+        return context
+
+    @asynccontextmanager
+    async def context(self, **options):
+        """Isolated context for the duration of the block, closed afterwards."""
+        context = await self.new_context(**options)
+        try:
+            yield context
+        finally:
+            await context.close()
+
+    async def render(
+        self,
+        url: str,
+        evaluate: str | None = None,
+        wait_until: str = "domcontentloaded",
+        wait_for: str | None = None,
+    ) -> Any:
+        """
+        Load `url` in a new tab and return its HTML, or the result of `evaluate`.
+
+        Args:
+            url: Page to load
+            evaluate: JavaScript function to run on the loaded page, e.g. LINKS_SCRIPT
+            wait_until: Load state to wait for ("domcontentloaded", "load", "networkidle")
+            wait_for: CSS selector to wait for before reading the page
+
+        Raises:
+            asyncio.TimeoutError: If the page took longer than `page_timeout`
+        """
+        async with self._semaphore:
+            page = await self._context.new_page()
+            try:
+                return await asyncio.wait_for(
+                    self._read(page, url, evaluate, wait_until, wait_for), self.page_timeout
+                )
+            finally:
+                await page.close()
+
+    async def _read(self, page, url, evaluate, wait_until, wait_for) -> Any:
+        await page.goto(url, wait_until=wait_until)
+        if wait_for:
+            await page.wait_for_selector(wait_for)
+        if evaluate:
+            return await page.evaluate(evaluate)
+        return await page.content()
+
+    async def render_all(self, urls: Iterable[str], **kwargs: Any) -> list[Any | None]:
+        """Render pages concurrently, in the order of `urls`; None for pages that failed."""
+
+        async def render_or_none(url: str) -> Any | None:
+            try:
+                return await self.render(url, **kwargs)
+            except Exception as e:
+                logger.warning("Failed to render %s: %s", url, e)
+                return None
+
+        return await asyncio.gather(*(render_or_none(url) for url in urls))
+
+
+class LazyBrowserPool:
+    """A `BrowserPool` that is only started when first needed, then kept for the block.
+
+    For scrapers that need a browser in some runs and at several steps: a run
+    that never calls `get()` starts no browser, and one that does starts one.
+
+        async with LazyBrowserPool() as browser:
+            pool = await browser.get()
+    """
+
+    def __init__(self, **pool_options: Any):
+        self.pool_options = pool_options
+        self._pool: BrowserPool | None = None
+
+    async def __aenter__(self) -> "LazyBrowserPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.__aexit__(*exc_info)
+
+    async def get(self) -> BrowserPool:
+        """The running pool, starting it on the first call."""
+        if self._pool is None:
+            pool = BrowserPool(**self.pool_options)
+            await pool.__aenter__()
+            self._pool = pool
+        return self._pool
+
+
+def render_pages(urls: list[str], pool_options: dict | None = None, **kwargs: Any) -> list:
+    """Synchronous wrapper: render `urls` with a pool that lives for this call only."""
+
+    async def run() -> list:
+        async with BrowserPool(**(pool_options or {})) as pool:
+            return await pool.render_all(urls, **kwargs)
+
+    return asyncio.run(run())
@@ -0,0 +1,144 @@
+"""Column-level mapping of raw scraper frames to the core schema.
+
+A mapping module may declare `COLUMN_MAPPING`, a dict from core column name to
+a column rule built with the helpers below. Each rule turns the whole raw
+frame into one Series, so mapping costs a handful of vectorized operations
+instead of one Python dict per row. Modules without `COLUMN_MAPPING` (or whose
+rules fail on a frame) are mapped with their row function, as before.
+
+Null handling matches the row functions with one simplification: NaN counts
+as missing, like None.
+"""
+
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ColumnRule = Callable[[pd.DataFrame], pd.Series]
+
+
+def _present(s: pd.Series) -> pd.Series:
+    """Mask of values a row function would treat as truthy (not null, not '' or 0)."""
+    mask = s.notna()
+    if s.dtype == object or pd.api.types.is_string_dtype(s):
+        mask &= s.ne('')
+    mask &= ~s.isin([0, False])
+    return mask
+
+
+def _nulls(df: pd.DataFrame) -> pd.Series:
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def constant(value: Any) -> ColumnRule:
+    """The same value on every row, e.g. the venue name."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        return pd.Series(value, index=df.index, dtype=object)
+    return rule
+
+
+def column(name: str) -> ColumnRule:
+    """The raw column unchanged (like `row.get(name)`); null when it is missing."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        return df[name] if name in df.columns else _nulls(df)
+    return rule
+
+
+def first_of(*columns: str, default: Any = None) -> ColumnRule:
+    """`row.get(a) or row.get(b) or ... or default`, evaluated column-wise.
+
+    Without a default, rows where nothing is present keep the last column's
+    value, just like a chain of `or`.
+    """
+    def rule(df: pd.DataFrame) -> pd.Series:
+        fallback = constant(default)(df) if default is not None else column(columns[-1])(df)
+        result = fallback.astype(object)
+        # Walk backwards so earlier columns win where they are present
+        for col in reversed(columns):
+            if col in df.columns:
+                result = df[col].where(_present(df[col]), result)
+        return result
+    return rule
+
+
+def nonempty(name: str) -> ColumnRule:
+    """The column where present, else null (like `row.get(c) if row.get(c) else None`)."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        if name not in df.columns:
+            return _nulls(df)
+        s = df[name]
+        return s.astype(object).where(_present(s), None)
+    return rule
+
+
+def prefixed(prefix: str, *columns: str) -> ColumnRule:
+    """`prefix` + the first present value among `columns`; null when none is present."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        values = first_of(*columns)(df)
+        present = _present(values)
+        return (prefix + values.astype(str)).where(present, None)
+    return rule
+
+
+def to_float(name: str) -> ColumnRule:
+    """The column as float; missing or unparsable values become null."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        if name not in df.columns:
+            return _nulls(df)
+        s = df[name]
+        return pd.to_numeric(s.where(_present(s)), errors='coerce')
+    return rule
+
+
+def parse_price(name: str) -> ColumnRule:
+    """Numbers as-is; the first number in a string ("€ 12,50" -> 12.5); else null."""
+    def rule(df: pd.DataFrame) -> pd.Series:
+        if name not in df.columns:
+            return _nulls(df)
+        s = df[name]
+        is_text = s.map(lambda v: isinstance(v, str)).astype(bool)
+        numbers = pd.to_numeric(s.where(~is_text), errors='coerce')
+        text = s.where(is_text).astype('string').str.replace(',', '.', regex=False)
+        extracted = pd.to_numeric(text.str.extract(r'([\d.]+)', expand=False), errors='coerce')
+        return numbers.where(~is_text, extracted.astype(float))
+    return rule
+
+
+def column_mapping_for(map_func: Callable) -> dict[str, ColumnRule] | None:
+    """Return the `COLUMN_MAPPING` declared next to a row mapping function, if any."""
+    module = inspect.getmodule(map_func)
+    return getattr(module, 'COLUMN_MAPPING', None)
+
+
+def apply_column_mapping(df_raw: pd.DataFrame, rules: dict[str, ColumnRule]) -> pd.DataFrame:
+    """Build the core frame column by column, in the order of `rules`."""
+    return pd.DataFrame(
+        {name: rule(df_raw) for name, rule in rules.items()}, index=df_raw.index
+    ).reset_index(drop=True)
+
+
+def apply_row_mapping(df_raw: pd.DataFrame, map_func: Callable) -> pd.DataFrame:
+    """Map with the row function: one dict per row."""
+    df_core = df_raw.apply(map_func, axis=1)
+    return pd.DataFrame(df_core.tolist())
+
+
+def map_records(df_raw: pd.DataFrame, map_func: Callable) -> pd.DataFrame:
+    """Map a raw frame to core records, column-wise when the venue declares rules."""
+    rules = column_mapping_for(map_func)
+    if rules is not None:
+        try:
+            return apply_column_mapping(df_raw, rules)
+        except Exception as e:
+            logger.warning(
+                'Column mapping for %s failed (%s); falling back to row mapping',
+                map_func.__name__,
+                e,
+            )
+    return apply_row_mapping(df_raw, map_func)
@@ -0,0 +1,172 @@
+"""Persistent on-disk cache of HTTP GET responses for the scrapers.
+
+Responses are stored in SQLite together with their validators (ETag and
+Last-Modified) and fetch time, so later runs can revalidate with a
+conditional GET and get a body-less 304 back instead of the full page.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILE = Path("data/http_cache.sqlite")
+# Entries not fetched or revalidated for this many days are deleted by `HttpCache.prune`
+CACHE_KEEP_DAYS = 30
+
+# Headers that describe the wire encoding; cached bodies are stored decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL has no cached response."""
+
+
+@dataclass(frozen=True)
+class CachedEntry:
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was last fetched or revalidated."""
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that ask the server to answer 304 if nothing changed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, cache_status: str = "HIT") -> requests.Response:
+        """Rebuild a requests.Response from the cached entry.
+
+        `cache_status` is exposed as the `X-Cache` response header.
+        """
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp.headers["X-Cache"] = cache_status
+        resp._content = self.body
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        return resp
+
+
+class HttpCache:
+    """SQLite-backed URL -> response store, safe to share between threads."""
+
+    def __init__(self, path: Path | str = CACHE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, url: str) -> CachedEntry | None:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT url, status_code, headers, body, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedEntry(
+            url=row[0],
+            status_code=row[1],
+            headers=json.loads(row[2]),
+            body=row[3],
+            etag=row[4],
+            last_modified=row[5],
+            fetched_at=row[6],
+        )
+
+    def put(self, url: str, resp: requests.Response) -> CachedEntry:
+        """Store a (decoded) response body with its validators."""
+        headers = {k: v for k, v in resp.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        entry = CachedEntry(
+            url=url,
+            status_code=resp.status_code,
+            headers=headers,
+            body=resp.content,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            fetched_at=time.time(),
+        )
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.fetched_at,
+                ),
+            )
+        return entry
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as fresh again after a 304 revalidation."""
+        with self._lock, self._con:
+            self._con.execute(
+                "UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def prune(self, keep_days: float = CACHE_KEEP_DAYS) -> int:
+        """Delete entries not fetched or revalidated within `keep_days`; returns how many.
+
+        URLs that are no longer requested (past events, old build IDs) would
+        otherwise stay in the file forever. The file is compacted afterwards.
+        """
+        cutoff = time.time() - keep_days * 24 * 60 * 60
+        with self._lock:
+            with self._con:
+                deleted = self._con.execute(
+                    "DELETE FROM responses WHERE fetched_at < ?", (cutoff,)
+                ).rowcount
+            if deleted:
+                self._con.execute("VACUUM")
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
@@ -1,12 +1,105 @@
+import hashlib
 import json
 import logging
+import re
+import threading
 import time
+from pathlib import Path
 from typing import Any
+from urllib.parse import urlparse
 
+import orjson
+import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import CACHE_FILE, CACHE_KEEP_DAYS, CacheMiss, HttpCache
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for the shared per-host sessions: how many host pools each
+# adapter caches, and how many keep-alive connections are kept open per host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# Optional on-disk response cache for GET requests (see `enable_cache`)
+_cache: HttpCache | None = None
+_offline = False
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the shared keep-alive session for the URL's scheme and host.
+
+    Reusing one session per host means a full run does one TCP+TLS handshake
+    per host (per concurrent connection) instead of one per request.
+    """
+    parsed = urlparse(url)
+    key = f"{parsed.scheme}://{parsed.netloc}"
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+    return session
+
+
+def configure_pools(pool_connections: int | None = None, pool_maxsize: int | None = None) -> None:
+    """Change the pool sizes used for sessions; existing sessions are closed."""
+    global POOL_CONNECTIONS, POOL_MAXSIZE
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    close_sessions()
+
+
+def close_sessions() -> None:
+    """Close all shared sessions and their pooled connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def enable_cache(
+    path: Path | str = CACHE_FILE,
+    offline: bool = False,
+    keep_days: float | None = CACHE_KEEP_DAYS,
+) -> HttpCache:
+    """Route GET requests through the on-disk response cache.
+
+    Cached URLs are revalidated with a conditional GET, and a 304 answer is served
+    from the cache. In offline mode nothing is sent: cached responses are returned
+    regardless of age and uncached URLs raise `CacheMiss`.
+
+    Entries not fetched or revalidated within `keep_days` are pruned first (not in
+    offline mode, which replays whatever was recorded; None keeps everything).
+    """
+    global _cache, _offline
+    disable_cache()
+    _cache = HttpCache(path)
+    _offline = offline
+    if not offline and keep_days is not None:
+        pruned = _cache.prune(keep_days)
+        if pruned:
+            logger.info(f"Pruned {pruned} HTTP cache entries older than {keep_days} days")
+    return _cache
+
+
+def disable_cache() -> None:
+    """Stop using the response cache and close it."""
+    global _cache, _offline
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+    _offline = False
+
 
 def safe_request(
     method: str,
@@ -19,41 +112,112 @@ def safe_request(
     retries: int = 3,
     backoff: float = 1.0,
     timeout: float = 10.0,
+    max_age: float | None = None,
 ) -> requests.Response:
     """Perform an HTTP request with retries and exponential backoff.
 
+    Requests go through the shared per-host session (see `get_session`). When the
+    response cache is enabled, a cached GET response younger than `max_age`
+    seconds is returned without contacting the server.
+
     Returns the final requests.Response (may be non-200). Raises the last exception
     only if all retries fail due to network errors.
     """
     last_exc = None
-    # Ensure a friendly default User-Agent to reduce blocks by some servers
-    hdrs = dict(headers or {})
-    if not any(k.lower() == "user-agent" for k in hdrs.keys()):
-        hdrs["User-Agent"] = "CultHeldDataAcquisition/1.0 (+https://github.com/ambrosiusvermeulen)"
+    hdrs = _with_user_agent(headers)
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.request(
-                method, url, headers=hdrs, params=params, data=data, json=json_body, timeout=timeout
-            )
-            return resp
+            return _send(method, url, hdrs, params, data, json_body, timeout, max_age)
         except requests.RequestException as e:
             last_exc = e
-            wait = backoff * (2 ** (attempt - 1))
-            logger.warning(
-                "HTTP %s to %s failed on attempt %d/%d: %s — retrying in %.1fs",
-                method,
-                url,
-                attempt,
-                retries,
-                e,
-                wait,
-            )
+            wait = _log_retry(method, url, attempt, retries, backoff, e)
             time.sleep(wait)
     # If we get here, all retries failed
     logger.error("All retries failed for %s %s: %s", method, url, last_exc)
     raise last_exc
 
 
+def _with_user_agent(headers: dict[str, str] | None) -> dict[str, str]:
+    # Ensure a friendly default User-Agent to reduce blocks by some servers
+    hdrs = dict(headers or {})
+    if not any(k.lower() == "user-agent" for k in hdrs.keys()):
+        hdrs["User-Agent"] = "CultHeldDataAcquisition/1.0 (+https://github.com/ambrosiusvermeulen)"
+    return hdrs
+
+
+def _send(
+    method: str,
+    url: str,
+    headers: dict[str, str],
+    params: dict[str, Any] | None,
+    data: Any | None,
+    json_body: Any | None,
+    timeout: float,
+    max_age: float | None = None,
+) -> requests.Response:
+    """Send a single request attempt through the shared session for the host.
+
+    GET requests consult the response cache first when it is enabled. Other
+    methods are only recorded, so that offline replays can serve them.
+    """
+    cache = _cache
+    if cache is None:
+        return get_session(url).request(
+            method, url, headers=headers, params=params, data=data, json=json_body, timeout=timeout
+        )
+
+    key = _cache_key(method, url, params, data, json_body)
+    entry = cache.get(key)
+    if _offline:
+        if entry is None:
+            raise CacheMiss(f"No cached response for {method} {url}")
+        return entry.to_response()
+    if method == "GET" and entry is not None:
+        if max_age is not None and entry.age < max_age:
+            return entry.to_response()
+        headers = {**headers, **entry.conditional_headers()}
+
+    resp = get_session(url).request(
+        method, url, headers=headers, params=params, data=data, json=json_body, timeout=timeout
+    )
+    if method == "GET" and resp.status_code == 304 and entry is not None:
+        cache.touch(key)
+        return entry.to_response("REVALIDATED")
+    if resp.status_code == 200:
+        cache.put(key, resp)
+    return resp
+
+
+def _cache_key(
+    method: str, url: str, params: dict[str, Any] | None, data: Any | None, json_body: Any | None
+) -> str:
+    """Cache key: the full URL for GET, plus method and a body digest otherwise."""
+    prepared = requests.Request(method, url, params=params, data=data, json=json_body).prepare()
+    if method == "GET":
+        return prepared.url
+    body = prepared.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return f"{method} {prepared.url} {hashlib.sha256(body).hexdigest()}"
+
+
+def _log_retry(
+    method: str, url: str, attempt: int, retries: int, backoff: float, exc: Exception
+) -> float:
+    """Log a failed attempt and return the exponential backoff to wait before the next."""
+    wait = backoff * (2 ** (attempt - 1))
+    logger.warning(
+        "HTTP %s to %s failed on attempt %d/%d: %s — retrying in %.1fs",
+        method,
+        url,
+        attempt,
+        retries,
+        exc,
+        wait,
+    )
+    return wait
+
+
 def safe_get(url: str, **kwargs) -> requests.Response:
     return safe_request("GET", url, **kwargs)
 
@@ -141,3 +305,84 @@ def safe_json(resp: requests.Response) -> Any:
                 e2,
             )
             raise ValueError("Invalid JSON response") from e2
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Parse JSON in one pass with orjson."""
+    return orjson.loads(data)
+
+
+def fast_json(resp: requests.Response) -> Any:
+    """Parse a response body straight from bytes; falls back to `safe_json` on failure."""
+    try:
+        return loads_json(resp.content)
+    except ValueError:
+        return safe_json(resp)
+
+
+# One step of a JSON path: a key, or a list index in brackets
+_JSON_PATH_STEP = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def json_path(data: Any, path: str) -> Any:
+    """
+    Follow a path like `pageProps.pageData.content[0].attributes` into parsed JSON.
+
+    Raises:
+        KeyError: Naming the first step of the path that does not exist
+    """
+    node = data
+    for key, index in _JSON_PATH_STEP.findall(path):
+        try:
+            node = node[int(index)] if index else node[key]
+        except (KeyError, IndexError, TypeError) as e:
+            step = key or f"[{index}]"
+            raise KeyError(f"JSON path {path!r} has no {step}") from e
+    return node
+
+
+def records_frame(
+    records: list[dict], schema: dict[str, str], keep_extra: bool = True
+) -> pd.DataFrame:
+    """
+    Build a DataFrame from JSON records with explicit column dtypes.
+
+    Schema columns come first, with the given dtype and no type inference;
+    records without a key get a null. A column whose values do not fit its
+    dtype is kept as object, with a warning. With `keep_extra`, keys outside
+    the schema follow as object columns, so nothing scraped is lost.
+    """
+    columns = {}
+    for name, dtype in schema.items():
+        values = [r.get(name) for r in records]
+        try:
+            columns[name] = pd.Series(values, dtype=dtype)
+        except (TypeError, ValueError) as e:
+            logger.warning("Column %s does not fit dtype %s (%s); kept as object", name, dtype, e)
+            columns[name] = pd.Series(values, dtype=object)
+    if keep_extra:
+        extra = dict.fromkeys(k for r in records for k in r if k not in schema)
+        for name in extra:
+            columns[name] = pd.Series([r.get(name) for r in records], dtype=object)
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(records)))
+
+
+def json_records(
+    resp: requests.Response,
+    path: str,
+    schema: dict[str, str],
+    item_path: str | None = None,
+) -> pd.DataFrame:
+    """
+    Decode a response once and turn the record list at `path` into a typed DataFrame.
+
+    Args:
+        resp: Response with a JSON body
+        path: JSON path of the record list, e.g. "data.program.events"
+        schema: Column name -> pandas dtype (see `records_frame`)
+        item_path: Path inside each item holding the record, e.g. "attributes"
+    """
+    items = json_path(fast_json(resp), path) or []
+    if item_path:
+        items = [json_path(item, item_path) for item in items]
+    return records_frame(items, schema)
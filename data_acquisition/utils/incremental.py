@@ -1,14 +1,17 @@
 """Incremental update tracking for scrapers."""
 
+import hashlib
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 STATE_FILE = Path("data/scraper_state.json")
+FINGERPRINT_DIR = Path("data/fingerprints")
 
 
 def get_last_run(venue: str) -> str | None:
@@ -99,3 +102,102 @@ def should_update(venue: str, min_hours: int = 24) -> bool:
     except Exception as e:
         logger.warning(f"Failed to parse last run time: {e}, will update")
         return True
+
+
+def fingerprint(*parts: Any) -> str:
+    """Return a short, stable hash of listing data (entry text, API payload, ...)."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _fingerprint_file(venue: str) -> Path:
+    return FINGERPRINT_DIR / f"{venue}.json"
+
+
+def _load_detail_state(venue: str) -> dict[str, dict]:
+    path = _fingerprint_file(venue)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to read fingerprints for {venue}: {e}")
+        return {}
+
+
+def plan_detail_fetches(
+    venue: str, fingerprints: dict[str, str], max_age_hours: float | None = None
+) -> tuple[list[str], dict[str, list[dict]]]:
+    """
+    Decide which detail pages need fetching for the current listing.
+
+    A listing entry is fetched when it is new, when its fingerprint changed since
+    the last run, or when its stored records are older than `max_age_hours`.
+
+    Args:
+        venue: Venue name
+        fingerprints: Listing key (event URL or slug) -> fingerprint of its listing entry
+        max_age_hours: Refetch unchanged entries after this many hours anyway
+
+    Returns:
+        Keys to fetch (in listing order), and the carried-forward records of
+        the unchanged keys
+    """
+    state = _load_detail_state(venue)
+    now = datetime.now()
+    to_fetch = []
+    carried = {}
+    for key, fp in fingerprints.items():
+        entry = state.get(key)
+        if entry is None or entry.get("fingerprint") != fp:
+            to_fetch.append(key)
+            continue
+        if max_age_hours is not None:
+            try:
+                age = now - datetime.fromisoformat(entry["fetched_at"])
+            except Exception:
+                to_fetch.append(key)
+                continue
+            if age.total_seconds() / 3600 >= max_age_hours:
+                to_fetch.append(key)
+                continue
+        carried[key] = entry.get("records", [])
+
+    logger.info(
+        f"{venue}: {len(to_fetch)} of {len(fingerprints)} detail pages new or changed, "
+        f"{len(carried)} carried forward"
+    )
+    return to_fetch, carried
+
+
+def save_detail_state(
+    venue: str, fingerprints: dict[str, str], fetched: dict[str, list[dict]]
+) -> None:
+    """
+    Store fingerprints and records after a scrape.
+
+    Entries for keys no longer in the listing are dropped. Keys missing from
+    `fetched` keep their previous state, so a failed fetch is retried next run.
+
+    Args:
+        venue: Venue name
+        fingerprints: Fingerprints of the current listing (as passed to `plan_detail_fetches`)
+        fetched: Key -> JSON-serializable records for the detail pages fetched this run
+    """
+    previous = _load_detail_state(venue)
+    now = datetime.now().isoformat()
+    state = {}
+    for key, fp in fingerprints.items():
+        if key in fetched:
+            state[key] = {"fingerprint": fp, "fetched_at": now, "records": fetched[key]}
+        elif previous.get(key, {}).get("fingerprint") == fp:
+            state[key] = previous[key]
+
+    path = _fingerprint_file(venue)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.error(f"Failed to write fingerprints for {venue}: {e}")
@@ -1,15 +1,164 @@
+"""Raw scraper snapshots in the staging area.
+
+Every scrape is stored as a ZSTD-compressed Parquet file per venue,
+data/staging/<venue>/<YYYY-MM-DD_HH-MM-SS_ffffff>.parquet, with the venue
+name URL-encoded like the partitions of the Parquet history. Column types
+survive the round trip (tz-aware start times stay timestamps), so mapping
+and validation can be replayed from staging without refetching anything.
+"""
+
+import json
+import os
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote, unquote
 
+import duckdb
 import pandas as pd
 
-RAW_CSV_DIR = Path("data/staging")
-RAW_CSV_DIR.mkdir(parents=True, exist_ok=True)
+from config import STAGING_KEEP_SNAPSHOTS
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STAGING_DIR = Path("data/staging")
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S_%f"
+# Scrapers localize start times to Amsterdam; read them back in the same zone
+LOCAL_TIMEZONE = "Europe/Amsterdam"
+
+
+@dataclass(frozen=True)
+class StagingSnapshot:
+    venue: str
+    taken_at: datetime
+    path: Path
+
+    def read(self) -> pd.DataFrame:
+        return read_raw_snapshot(self.path)
+
+
+def _venue_dir(venue: str, staging_dir: Path) -> Path:
+    return staging_dir / quote(venue, safe="")
+
+
+def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Make object columns storable in Parquet.
+
+    Columns holding one scalar type are kept as they are. Nested values
+    (dicts, lists) are stored as JSON text and columns mixing scalar types
+    (e.g. prices as numbers and strings) as plain text.
+    """
+    converted = {}
+    for name in df.select_dtypes(include="object").columns:
+        values = df[name].dropna()
+        types = set(map(type, values))
+        if len(types) <= 1 and not types & {dict, list}:
+            continue
+        converted[name] = df[name].map(_to_text)
+    return df.assign(**converted) if converted else df
+
+
+def _to_text(value):
+    if isinstance(value, dict | list):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    if pd.isna(value):
+        return None
+    return str(value)
+
+
+def save_raw_snapshot(
+    df: pd.DataFrame,
+    venue: str,
+    keep: int | None = STAGING_KEEP_SNAPSHOTS,
+    staging_dir: Path = STAGING_DIR,
+) -> Path | None:
+    """
+    Save a raw scrape as a Parquet snapshot and drop the venue's oldest snapshots.
+
+    Args:
+        df: Raw scraper output
+        venue: Venue name (one directory per venue)
+        keep: Number of snapshots to keep for the venue; None keeps all
+        staging_dir: Root of the staging area
+
+    Returns:
+        Path of the written snapshot, or None for a frame without columns
+    """
+    if len(df.columns) == 0:
+        logger.info(f"No raw columns for {venue}; no staging snapshot written")
+        return None
+
+    venue_dir = _venue_dir(venue, staging_dir)
+    venue_dir.mkdir(parents=True, exist_ok=True)
+    path = venue_dir / f"{datetime.now().strftime(TIMESTAMP_FORMAT)}.parquet"
+    tmp_path = path.with_suffix(".parquet.tmp")
+
+    con = duckdb.connect()
+    try:
+        con.register("raw", _parquet_safe(df.reset_index(drop=True)))
+        con.execute(f"COPY raw TO '{tmp_path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+    finally:
+        con.close()
+    os.replace(tmp_path, path)
+    logger.info(f"Saved raw snapshot: {path} ({len(df)} rows)")
+
+    if keep is not None:
+        prune_snapshots(venue, keep, staging_dir)
+    return path
+
+
+def prune_snapshots(venue: str, keep: int, staging_dir: Path = STAGING_DIR) -> int:
+    """Delete all but the `keep` newest snapshots of a venue; returns how many were deleted."""
+    snapshots = list_snapshots(venue, staging_dir=staging_dir)
+    stale = snapshots[:-keep] if keep > 0 else snapshots
+    for snapshot in stale:
+        snapshot.path.unlink(missing_ok=True)
+    if stale:
+        logger.info(f"Pruned {len(stale)} staging snapshots of {venue}")
+    return len(stale)
+
+
+def list_snapshots(
+    venue: str | None = None,
+    since: datetime | None = None,
+    staging_dir: Path = STAGING_DIR,
+) -> list[StagingSnapshot]:
+    """
+    List staging snapshots, oldest first.
+
+    Args:
+        venue: Only this venue's snapshots (default: all venues)
+        since: Only snapshots taken at or after this (naive, local) time
+        staging_dir: Root of the staging area
+    """
+    venue_dirs = (
+        [_venue_dir(venue, staging_dir)] if venue is not None
+        else [p for p in staging_dir.glob("*") if p.is_dir()]
+    )
+    snapshots = []
+    for venue_dir in venue_dirs:
+        for path in venue_dir.glob("*.parquet"):
+            try:
+                taken_at = datetime.strptime(path.stem, TIMESTAMP_FORMAT)
+            except ValueError:
+                continue
+            if since is None or taken_at >= since:
+                snapshots.append(StagingSnapshot(unquote(venue_dir.name), taken_at, path))
+    return sorted(snapshots, key=lambda s: (s.taken_at, s.venue))
+
+
+def latest_snapshot(venue: str, staging_dir: Path = STAGING_DIR) -> StagingSnapshot | None:
+    """The venue's most recent snapshot, if any."""
+    snapshots = list_snapshots(venue, staging_dir=staging_dir)
+    return snapshots[-1] if snapshots else None
+
 
-def save_raw_csv(df: pd.DataFrame, scraper_name: str) -> Path:
-    """Save raw scraped data to a timestamped CSV."""
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    csv_file = RAW_CSV_DIR / f"{scraper_name}_{timestamp}.csv"
-    df.to_csv(csv_file, index=False)
-    print(f"Saved raw CSV snapshot: {csv_file}")
-    return csv_file
+def read_raw_snapshot(path: Path) -> pd.DataFrame:
+    """Read a snapshot back as the raw frame (timestamps with a zone in Europe/Amsterdam)."""
+    con = duckdb.connect()
+    try:
+        con.execute(f"SET TimeZone = '{LOCAL_TIMEZONE}'")
+        return con.execute("SELECT * FROM read_parquet(?)", [str(path)]).df()
+    finally:
+        con.close()
@@ -16,6 +16,8 @@ function App() {
   const [error, setError] = useState(null)
   const [venues, setVenues] = useState([])
   const [eventTypes, setEventTypes] = useState([])
+  const [venueCounts, setVenueCounts] = useState({})
+  const [eventTypeCounts, setEventTypeCounts] = useState({})
   const [darkMode, setDarkMode] = useState(() => {
     return localStorage.getItem('darkMode') === 'true'
   })
@@ -25,6 +27,7 @@ function App() {
   const [limit, setLimit] = useState(50)
   const [total, setTotal] = useState(0)
   const [hasMore, setHasMore] = useState(true)
+  const [nextCursor, setNextCursor] = useState(null)
 
   // Filter and search state with default dates (today to today + 7 days)
   const getDefaultDates = () => {
@@ -56,27 +59,34 @@ function App() {
     localStorage.setItem('darkMode', darkMode)
   }, [darkMode])
 
-  // Fetch venues and event types on mount
+  // Fetch venues and event types, with counts for the active filters, in one request
   useEffect(() => {
-    const fetchMetadata = async () => {
+    const fetchFacets = async () => {
       try {
-        const [venuesRes, typesRes] = await Promise.all([
-          axios.get(`${API_BASE}/venues`),
-          axios.get(`${API_BASE}/event-types`),
-        ])
-        setVenues(venuesRes.data.venues)
-        setEventTypes(typesRes.data.event_types)
+        const params = Object.fromEntries(
+          Object.entries(filters).filter(([, v]) => v !== '')
+        )
+        if (searchQuery && searchQuery.trim() !== '') {
+          params.search = searchQuery
+        }
+        const response = await axios.get(`${API_BASE}/facets`, { params })
+        const toCounts = (facet) => Object.fromEntries(facet.map(f => [f.value, f.count]))
+        setVenues(response.data.venues.map(f => f.value))
+        setEventTypes(response.data.event_types.map(f => f.value))
+        setVenueCounts(toCounts(response.data.venues))
+        setEventTypeCounts(toCounts(response.data.event_types))
       } catch (err) {
-        console.error('Failed to fetch metadata:', err)
+        console.error('Failed to fetch facets:', err)
       }
     }
-    fetchMetadata()
-  }, [])
+    fetchFacets()
+  }, [filters, searchQuery])
 
   // Fetch events - reset offset when filters change
   useEffect(() => {
     setOffset(0)
     setHasMore(true)
+    setNextCursor(null)
   }, [filters, searchQuery])
 
   // Fetch events when offset changes OR filters change
@@ -89,9 +99,12 @@ function App() {
       }
       setError(null)
       try {
+        // Later pages continue from the cursor so deep pages cost the same as the first
         const params = {
-          offset,
+          ...(offset === 0 || !nextCursor ? { offset } : { cursor: nextCursor }),
           limit,
+          // The total only changes with the filters, so only ask for it on the first page
+          include_total: offset === 0,
           ...Object.fromEntries(
             Object.entries(filters).filter(([, v]) => v !== '')
           ),
@@ -110,8 +123,13 @@ function App() {
           setEvents(prev => [...prev, ...response.data.events])
         }
         
-        setTotal(response.data.total)
-        setHasMore(offset + limit < response.data.total)
+        setNextCursor(response.data.next_cursor)
+        if (response.data.total !== null) {
+          setTotal(response.data.total)
+          setHasMore(offset + limit < response.data.total)
+        } else {
+          setHasMore(response.data.events.length === limit)
+        }
       } catch (err) {
         setError('Failed to fetch events. Make sure the backend is running.')
         console.error(err)
@@ -170,6 +188,8 @@ function App() {
         <FilterBar
           venues={venues}
           eventTypes={eventTypes}
+          venueCounts={venueCounts}
+          eventTypeCounts={eventTypeCounts}
           filters={filters}
           onFilterChange={handleFilterChange}
           onResetFilters={handleResetFilters}
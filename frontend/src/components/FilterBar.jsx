@@ -1,9 +1,12 @@
 import React, { useState } from 'react'
 import './FilterBar.css'
 
-function FilterBar({ venues, eventTypes, filters, onFilterChange, onResetFilters, onSearchChange, searchQuery }) {
+function FilterBar({ venues, eventTypes, venueCounts = {}, eventTypeCounts = {}, filters, onFilterChange, onResetFilters, onSearchChange, searchQuery }) {
   const [isOpen, setIsOpen] = useState(false)
 
+  const withCount = (value, counts) =>
+    counts[value] !== undefined ? `${value} (${counts[value]})` : value
+
   const handleChange = (e) => {
     const { name, value } = e.target
     onFilterChange({
@@ -59,7 +62,7 @@ function FilterBar({ venues, eventTypes, filters, onFilterChange, onResetFilters
             <option value="">All Venues</option>
             {venues.map((v) => (
               <option key={v} value={v}>
-                {v}
+                {withCount(v, venueCounts)}
               </option>
             ))}
           </select>
@@ -75,7 +78,7 @@ function FilterBar({ venues, eventTypes, filters, onFilterChange, onResetFilters
             <option value="">All Types</option>
             {eventTypes.map((t) => (
               <option key={t} value={t}>
-                {t}
+                {withCount(t, eventTypeCounts)}
               </option>
             ))}
           </select>